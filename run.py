@@ -7,68 +7,178 @@ del proyecto sin necesidad de recordar comandos complejos.
 """
 
 import sys
-import subprocess
 import os
-from pathlib import Path
+
+
+HEADER = (
+    "=" * 60 + "\n"
+    "  🏛️  FACADE PATTERN - ENTERPRISE ORDER MANAGEMENT\n"
+    "  📚 Laboratorio de Patrones de Diseño Empresarial\n"
+    "  👨‍💻 Sebastian Fuentes Avalos - UPT FAING-EPIS\n"
+    + "=" * 60 + "\n"
+)
+
+MENU = (
+    "\n📋 Opciones disponibles:\n"
+    "  1. 🚀 Ejecutar demo automatizada\n"
+    "  2. 🎮 Ejecutar demo interactiva\n"
+    "  3. 🧪 Ejecutar todos los tests\n"
+    "  4. 📊 Ejecutar tests con coverage\n"
+    "  5. 🔍 Ejecutar solo tests del Facade\n"
+    "  6. 📈 Ver estadísticas del proyecto\n"
+    "  7. 🛠️  Verificar calidad del código\n"
+    "  8. 📦 Instalar dependencias de desarrollo\n"
+    "  9. 📖 Mostrar documentación\n"
+    "  0. ❌ Salir\n"
+)
 
 
 def print_header():
     """Imprime el header del proyecto."""
-    print("=" * 60)
-    print("  🏛️  FACADE PATTERN - ENTERPRISE ORDER MANAGEMENT")
-    print("  📚 Laboratorio de Patrones de Diseño Empresarial")
-    print("  👨‍💻 Sebastian Fuentes Avalos - UPT FAING-EPIS")
-    print("=" * 60)
+    sys.stdout.write(HEADER)
 
 
 def print_menu():
     """Muestra el menú de opciones disponibles."""
-    print("\n📋 Opciones disponibles:")
-    print("  1. 🚀 Ejecutar demo automatizada")
-    print("  2. 🎮 Ejecutar demo interactiva") 
-    print("  3. 🧪 Ejecutar todos los tests")
-    print("  4. 📊 Ejecutar tests con coverage")
-    print("  5. 🔍 Ejecutar solo tests del Facade")
-    print("  6. 📈 Ver estadísticas del proyecto")
-    print("  7. 🛠️  Verificar calidad del código")
-    print("  8. 📦 Instalar dependencias de desarrollo")
-    print("  9. 📖 Mostrar documentación")
-    print("  0. ❌ Salir")
-
-
-def run_command(command, description):
-    """Ejecuta un comando del sistema."""
+    sys.stdout.write(MENU)
+
+
+MENU_CHOICES = "0123456789?"
+
+
+def setup_readline():
+    """Habilita autocompletado con Tab para las opciones del menú, si hay readline."""
+    try:
+        import readline
+    except ImportError:
+        return
+
+    def complete(text, state):
+        matches = [c for c in MENU_CHOICES if c.startswith(text)]
+        return matches[state] if state < len(matches) else None
+
+    readline.set_completer(complete)
+    readline.parse_and_bind("tab: complete")
+
+
+def run_command(argv, description):
+    """Ejecuta un comando del sistema (lista de argumentos, sin pasar por la shell)."""
+    import subprocess
+
     print(f"\n🔄 {description}...")
-    print(f"💻 Ejecutando: {command}")
+    print(f"💻 Ejecutando: {' '.join(argv)}")
     print("-" * 50)
     
     try:
-        result = subprocess.run(command, shell=True, check=True)
+        subprocess.run(argv, check=True)
         print(f"✅ {description} completado exitosamente")
         return True
     except subprocess.CalledProcessError as e:
         print(f"❌ Error ejecutando {description}: {e}")
         return False
+    except FileNotFoundError:
+        print(f"❌ Error ejecutando {description}: comando '{argv[0]}' no encontrado")
+        return False
     except KeyboardInterrupt:
         print(f"\n⏹️  {description} interrumpido por el usuario")
         return False
 
 
+def run_pytest(args, description):
+    """Ejecuta pytest, en el mismo proceso si se pasó --in-process."""
+    if "--in-process" not in sys.argv:
+        return run_command([sys.executable, "-m", "pytest", *args], description)
+
+    import pytest
+
+    print(f"\n🔄 {description}...")
+    print(f"💻 Ejecutando en proceso: pytest {' '.join(args)}")
+    print("-" * 50)
+
+    try:
+        exit_code = pytest.main(list(args))
+    except KeyboardInterrupt:
+        print(f"\n⏹️  {description} interrumpido por el usuario")
+        return False
+
+    if exit_code == 0:
+        print(f"✅ {description} completado exitosamente")
+        return True
+    print(
+        f"❌ Error ejecutando {description}: "
+        f"pytest terminó con código {int(exit_code)}"
+    )
+    return False
+
+
+SKIPPED_DIRS = {
+    ".git",
+    "__pycache__",
+    "htmlcov",
+    ".venv",
+    "venv",
+    ".tox",
+    ".mypy_cache",
+    ".pytest_cache",
+}
+
+
+def walk_py_files(root):
+    """Recorre el árbol con os.scandir y produce las rutas de archivos .py."""
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    # DirEntry reutiliza el tipo que entrega readdir, sin stat extra
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SKIPPED_DIRS:
+                            stack.append(entry.path)
+                    elif entry.name.endswith(".py"):
+                        yield entry.path
+        except OSError:
+            pass
+
+
+READ_CHUNK_SIZE = 1 << 20
+
+
+def count_lines(path):
+    """Cuenta los saltos de línea de un archivo sin decodificarlo."""
+    try:
+        with open(path, 'rb') as f:
+            # Lectura por bloques: el conteo ocurre en C y la memoria queda acotada
+            return sum(
+                chunk.count(b'\n')
+                for chunk in iter(lambda: f.read(READ_CHUNK_SIZE), b'')
+            )
+    except OSError:
+        return 0
+
+
 def check_dependencies():
     """Verifica que las dependencias estén instaladas."""
-    try:
-        import pytest
+    import importlib.util
+
+    # find_spec solo localiza el paquete, sin cargar pytest en este proceso
+    if importlib.util.find_spec("pytest") is not None:
         return True
-    except ImportError:
-        print("⚠️  Dependencias no encontradas.")
-        install = input("¿Deseas instalar las dependencias de desarrollo? (y/N): ")
-        if install.lower() == 'y':
-            return run_command("pip install -r requirements-dev.txt", "Instalación de dependencias")
-        return False
+
+    print("⚠️  Dependencias no encontradas.")
+    install = input("¿Deseas instalar las dependencias de desarrollo? (y/N): ")
+    if install.lower() == 'y':
+        return run_command(
+            [sys.executable, "-m", "pip", "install", "-r", "requirements-dev.txt"],
+            "Instalación de dependencias"
+        )
+    return False
 
 
 def main():
     """Función principal del script."""
+    from pathlib import Path
+
     print_header()
     
     # Verificar que estamos en el directorio correcto
@@ -77,11 +187,16 @@ def main():
         print("📁 Directorio actual:", os.getcwd())
         return 1
     
+    setup_readline()
+
+    # El menú se muestra una vez; "?" lo vuelve a imprimir cuando se necesite
+    print_menu()
+
     while True:
-        print_menu()
-        
         try:
-            choice = input("\n🎯 Selecciona una opción (0-9): ").strip()
+            choice = input(
+                "\n🎯 Selecciona una opción (0-9, ? para ver el menú): "
+            ).strip()
         except KeyboardInterrupt:
             print("\n👋 ¡Hasta luego!")
             return 0
@@ -89,29 +204,44 @@ def main():
         if choice == "0":
             print("\n👋 ¡Hasta luego!")
             break
+
+        elif choice == "?":
+            print_menu()
+            continue
             
         elif choice == "1":
-            run_command("python -m src.order_facade.demo", "Demo automatizada")
+            run_command(
+                [sys.executable, "-m", "src.order_facade.demo"], "Demo automatizada"
+            )
             
         elif choice == "2":
-            run_command("python -m src.order_facade.demo --interactive", "Demo interactiva")
+            run_command(
+                [sys.executable, "-m", "src.order_facade.demo", "--interactive"],
+                "Demo interactiva"
+            )
             
         elif choice == "3":
             if check_dependencies():
-                run_command("pytest tests/ -v", "Tests unitarios")
+                run_pytest(["tests/", "-v"], "Tests unitarios")
             
         elif choice == "4":
             if check_dependencies():
-                run_command(
-                    "pytest tests/ -v --cov=src/order_facade --cov-report=html --cov-report=term",
+                run_pytest(
+                    [
+                        "tests/",
+                        "-v",
+                        "--cov=src/order_facade",
+                        "--cov-report=html",
+                        "--cov-report=term",
+                    ],
                     "Tests con coverage"
                 )
                 print("\n📊 Reporte HTML generado en: htmlcov/index.html")
             
         elif choice == "5":
             if check_dependencies():
-                run_command(
-                    "pytest tests/test_facade.py::TestOrderFacade -v",
+                run_pytest(
+                    ["tests/test_facade.py::TestOrderFacade", "-v"],
                     "Tests específicos del Facade"
                 )
             
@@ -119,23 +249,19 @@ def main():
             print("\n📈 Estadísticas del Proyecto:")
             print("-" * 30)
             
-            # Contar archivos Python
-            py_files = list(Path(".").rglob("*.py"))
-            src_files = list(Path("src").rglob("*.py"))
-            test_files = list(Path("tests").rglob("*.py"))
+            # Contar archivos Python (un solo recorrido del árbol)
+            py_files = list(walk_py_files("."))
+            src_prefix = os.path.join(".", "src", "")
+            test_prefix = os.path.join(".", "tests", "")
+            src_files = [f for f in py_files if f.startswith(src_prefix)]
+            test_files = [f for f in py_files if f.startswith(test_prefix)]
             
             print(f"📁 Total archivos Python: {len(py_files)}")
             print(f"🔧 Archivos fuente: {len(src_files)}")
             print(f"🧪 Archivos de test: {len(test_files)}")
             
             # Contar líneas de código
-            total_lines = 0
-            for file in src_files:
-                try:
-                    with open(file, 'r', encoding='utf-8') as f:
-                        total_lines += len(f.readlines())
-                except:
-                    pass
+            total_lines = sum(count_lines(file) for file in src_files)
             
             print(f"📝 Líneas de código (aprox): {total_lines}")
             print(f"📦 Directorio actual: {os.getcwd()}")
@@ -146,18 +272,33 @@ def main():
             if not check_dependencies():
                 continue
                 
-            print("\n1️⃣ Verificando formato con Black...")
-            run_command("black --check src/ tests/", "Verificación de formato")
-            
-            print("\n2️⃣ Verificando estilo con Flake8...")
-            run_command("flake8 src/ tests/", "Verificación de estilo")
-            
-            print("\n3️⃣ Verificando tipos con MyPy...")
-            run_command("mypy src/order_facade/", "Verificación de tipos")
+            # Black, Flake8 y MyPy en secuencia, deteniéndose en el primer fallo
+            quality_checks = [
+                (["black", "--check", "src/", "tests/"], "Verificación de formato"),
+                (["flake8", "src/", "tests/"], "Verificación de estilo"),
+                (["mypy", "src/order_facade/"], "Verificación de tipos"),
+            ]
+            for argv, description in quality_checks:
+                # Con el intérprete actual, como pytest y pip, aunque el venv
+                # no esté activado en el PATH
+                if not run_command([sys.executable, "-m", *argv], description):
+                    break
             
         elif choice == "8":
-            run_command("pip install -r requirements-dev.txt", "Instalación de dependencias de desarrollo")
-            run_command("pip install -e .", "Instalación del paquete en modo desarrollo")
+            run_command(
+                [sys.executable, "-m", "pip", "install", "-r", "requirements-dev.txt"],
+                "Instalación de dependencias de desarrollo"
+            )
+            run_command(
+                [sys.executable, "-m", "pip", "install", "-e", "."],
+                "Instalación del paquete en modo desarrollo"
+            )
+            # Precompilar bytecode para que la primera ejecución no compile
+            # el código fuente
+            run_command(
+                [sys.executable, "-m", "compileall", "-q", "src/"],
+                "Compilación de bytecode"
+            )
             
         elif choice == "9":
             print("\n📖 Documentación del Proyecto")
@@ -174,7 +315,10 @@ def main():
             print("• Enterprise Patterns: https://martinfowler.com/eaaCatalog/")
             
         else:
-            print("❌ Opción no válida. Por favor selecciona un número del 0 al 9.")
+            print(
+                "❌ Opción no válida. "
+                "Selecciona un número del 0 al 9 o ? para ver el menú."
+            )
         
         if choice != "0":
             input("\n⏸️  Presiona Enter para continuar...")
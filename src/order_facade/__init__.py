@@ -9,7 +9,20 @@ Fecha: 2025-11-07
 Licencia: MIT
 """
 
-from .facade import OrderFacade, OrderResult
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .facade import OrderFacade, OrderResult
 
 __version__ = "1.0.0"
 __all__ = ["OrderFacade", "OrderResult"]
+
+
+def __getattr__(name: str) -> Any:
+    """Importa el facade y sus subsistemas solo cuando se accede a ellos (PEP 562)."""
+    if name in __all__:
+        from .facade import OrderFacade, OrderResult
+
+        globals().update(OrderFacade=OrderFacade, OrderResult=OrderResult)
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -6,15 +6,54 @@ en el sistema de gestión de pedidos, mostrando diferentes escenarios
 y casos de uso.
 """
 
+from __future__ import annotations
+
+import logging
 import sys
 import os
-from typing import Dict, List
+from functools import lru_cache
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Dict, List
 
-# Agregar el directorio src al path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+# Los imports del facade se difieren hasta que una demo se ejecuta realmente
+if TYPE_CHECKING:
+    from order_facade import OrderFacade, OrderResult
 
-from order_facade import OrderFacade, OrderResult
-from order_facade.services.notifications import NotificationChannel
+# Datos de pago y envío compartidos por los escenarios (solo lectura)
+_PAYMENT_VISA = MappingProxyType(
+    {
+        "card_number": "4111111111111111",
+        "cvv": "123",
+        "expiry": "12/27",
+        "cardholder": "Juan Pérez",
+    }
+)
+_PAYMENT_MC = MappingProxyType(
+    {
+        "card_number": "5555555555554444",
+        "cvv": "456",
+        "expiry": "08/26",
+        "cardholder": "María García",
+    }
+)
+_PAYMENT_VISA_BASIC = MappingProxyType(
+    {"card_number": "4111111111111111", "cvv": "123"}
+)
+_PAYMENT_DECLINED = MappingProxyType(
+    {
+        "card_number": "3782822463100005",  # Amex - será rechazada
+        "cvv": "1234",
+        "expiry": "12/25",
+    }
+)
+_SHIP_LIMA = MappingProxyType(
+    {
+        "street": "Av. Arequipa 1234",
+        "city": "Lima",
+        "zip_code": "15001",
+        "country": "Perú",
+    }
+)
 
 
 def print_separator(title: str = "") -> None:
@@ -25,94 +64,124 @@ def print_separator(title: str = "") -> None:
         print("=" * 60)
 
 
+@lru_cache(maxsize=1)
+def _make_facade() -> OrderFacade:
+    """
+    Crea el facade de la demo una sola vez por proceso.
+
+    Usar _make_facade.cache_clear() para reiniciarlo.
+    """
+    from order_facade import OrderFacade
+
+    return OrderFacade()
+
+
+def _pause(message: str) -> None:
+    """Espera Enter del usuario, salvo en ejecuciones no interactivas (CI, pipes)."""
+    if not sys.stdin.isatty() or os.environ.get("DEMO_NONINTERACTIVE"):
+        return
+    try:
+        input(message)
+    except EOFError:
+        pass
+
+
 def print_result(result: OrderResult, scenario: str) -> None:
     """Imprime el resultado de un pedido de forma formateada."""
-    print(f"\n🎯 Escenario: {scenario}")
-    print("-" * 40)
+    order_id_short = result.order_id[:8] if result.order_id else "N/A"
+    lines = [f"\n🎯 Escenario: {scenario}", "-" * 40]
 
     if result.success:
-        print("✅ Estado: EXITOSO")
-        order_id_short = result.order_id[:8] if result.order_id else "N/A"
-        print(f"📦 ID del Pedido: {order_id_short}...")
-        print(f"💳 ID Transacción: {result.transaction_id}")
-        print(f"🚚 Número de Seguimiento: {result.tracking_number}")
-        print(f"💰 Total Pagado: ${result.total_amount:.2f}")
-        print(f"📅 Entrega Estimada: {result.estimated_delivery}")
+        lines += [
+            "✅ Estado: EXITOSO",
+            f"📦 ID del Pedido: {order_id_short}...",
+            f"💳 ID Transacción: {result.transaction_id}",
+            f"🚚 Número de Seguimiento: {result.tracking_number}",
+            f"💰 Total Pagado: ${result.total_amount:.2f}",
+            f"📅 Entrega Estimada: {result.estimated_delivery}",
+        ]
     else:
-        print("❌ Estado: FALLIDO")
-        order_id_short = result.order_id[:8] if result.order_id else "N/A"
-        print(f"📦 ID del Pedido: {order_id_short}...")
-        print(f"⚠️  Razón: {result.reason}")
+        lines += [
+            "❌ Estado: FALLIDO",
+            f"📦 ID del Pedido: {order_id_short}...",
+            f"⚠️  Razón: {result.reason}",
+        ]
         if result.transaction_id:
-            print(f"💳 ID Transacción: {result.transaction_id}")
+            lines.append(f"💳 ID Transacción: {result.transaction_id}")
+
+    # Una sola escritura por bloque en lugar de un print() por línea
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+# Escenarios de pedidos exitosos:
+# (anuncio, cliente, sku, cantidad, pago, precio, dirección, tipo de envío, etiqueta)
+_SUCCESSFUL_SCENARIOS = (
+    (
+        "pedido estándar",
+        "customer_001",
+        "MONITOR-27",
+        1,
+        _PAYMENT_VISA,
+        299.99,
+        _SHIP_LIMA,
+        "standard",
+        'Pedido Estándar - Monitor 27"',
+    ),
+    (
+        "pedido express",
+        "customer_002",
+        "LAPTOP-15",
+        1,
+        _PAYMENT_MC,
+        899.99,
+        None,
+        "express",
+        'Pedido Express - Laptop 15"',
+    ),
+    (
+        "pedido de múltiples unidades",
+        "customer_003",
+        "SMARTPHONE-X",
+        2,
+        _PAYMENT_VISA,
+        649.99,
+        None,
+        "premium",
+        "Pedido Premium - 2x Smartphone X",
+    ),
+)
 
 
 def demo_successful_orders(facade: OrderFacade) -> List[OrderResult]:
     """Demuestra pedidos exitosos."""
     print_separator("DEMO 1: PEDIDOS EXITOSOS")
 
-    # Configurar información de pago válida (Visa)
-    payment_info_visa = {
-        "card_number": "4111111111111111",
-        "cvv": "123",
-        "expiry": "12/27",
-        "cardholder": "Juan Pérez",
-    }
-
-    # Configurar información de pago válida (MasterCard)
-    payment_info_mc = {
-        "card_number": "5555555555554444",
-        "cvv": "456",
-        "expiry": "08/26",
-        "cardholder": "María García",
-    }
-
-    # Dirección de envío
-    shipping_address = {
-        "street": "Av. Arequipa 1234",
-        "city": "Lima",
-        "zip_code": "15001",
-        "country": "Perú",
-    }
-
-    # Escenario 1: Pedido estándar con Visa
-    print("\n🛒 Realizando pedido estándar...")
-    result1 = facade.place_order(
-        customer_id="customer_001",
-        sku="MONITOR-27",
-        qty=1,
-        payment_info=payment_info_visa,
-        unit_price=299.99,
-        shipping_address=shipping_address,
-        shipping_type="standard",
-    )
-    print_result(result1, 'Pedido Estándar - Monitor 27"')
-
-    # Escenario 2: Pedido express con MasterCard
-    print("\n🛒 Realizando pedido express...")
-    result2 = facade.place_order(
-        customer_id="customer_002",
-        sku="LAPTOP-15",
-        qty=1,
-        payment_info=payment_info_mc,
-        unit_price=899.99,
-        shipping_type="express",
-    )
-    print_result(result2, 'Pedido Express - Laptop 15"')
-
-    # Escenario 3: Pedido múltiple
-    print("\n🛒 Realizando pedido de múltiples unidades...")
-    result3 = facade.place_order(
-        customer_id="customer_003",
-        sku="SMARTPHONE-X",
-        qty=2,
-        payment_info=payment_info_visa,
-        unit_price=649.99,
-        shipping_type="premium",
-    )
-    print_result(result3, "Pedido Premium - 2x Smartphone X")
+    results = []
+    for (
+        announcement,
+        customer_id,
+        sku,
+        qty,
+        payment,
+        unit_price,
+        address,
+        shipping_type,
+        label,
+    ) in _SUCCESSFUL_SCENARIOS:
+        print(f"\n🛒 Realizando {announcement}...")
+        result = facade.place_order(
+            customer_id=customer_id,
+            sku=sku,
+            qty=qty,
+            payment_info=dict(payment),
+            unit_price=unit_price,
+            shipping_address=dict(address) if address else None,
+            shipping_type=shipping_type,
+        )
+        print_result(result, label)
+        results.append(result)
 
-    return [result1, result2, result3]
+    return results
 
 
 def demo_failed_orders(facade: OrderFacade) -> None:
@@ -125,24 +194,18 @@ def demo_failed_orders(facade: OrderFacade) -> None:
         customer_id="customer_004",
         sku="WASHER-7KG",  # Solo hay 2 en stock
         qty=5,  # Pidiendo más de lo disponible
-        payment_info={"card_number": "4111111111111111", "cvv": "123"},
+        payment_info=dict(_PAYMENT_VISA_BASIC),
         unit_price=499.99,
     )
     print_result(result1, "Error - Stock Insuficiente")
 
     # Escenario 2: Pago rechazado (American Express)
     print("\n🛒 Intentando pedido con pago rechazado...")
-    payment_declined = {
-        "card_number": "3782822463100005",  # Amex - será rechazada
-        "cvv": "1234",
-        "expiry": "12/25",
-    }
-
     result2 = facade.place_order(
         customer_id="customer_005",
         sku="TABLET-10",
         qty=1,
-        payment_info=payment_declined,
+        payment_info=dict(_PAYMENT_DECLINED),
         unit_price=299.99,
     )
     print_result(result2, "Error - Pago Rechazado")
@@ -153,7 +216,7 @@ def demo_failed_orders(facade: OrderFacade) -> None:
         customer_id="customer_006",
         sku="NONEXISTENT-PRODUCT",
         qty=1,
-        payment_info={"card_number": "4111111111111111", "cvv": "123"},
+        payment_info=dict(_PAYMENT_VISA_BASIC),
         unit_price=99.99,
     )
     print_result(result3, "Error - Producto No Existe")
@@ -204,11 +267,12 @@ def demo_customer_history(facade: OrderFacade) -> None:
 
     if history:
         for i, order in enumerate(history, 1):
+            order_id_short = order["order_id"][:8]
+            sku, qty = order["sku"], order["qty"]
+            total, status = order["total_amount"], order["status"]
             print(
-                f"   {i}. Pedido {order['order_id'][:8]}... - {order['sku']} x {order['qty']}"
-            )
-            print(
-                f"      Total: ${order['total_amount']:.2f} - Estado: {order['status']}"
+                f"   {i}. Pedido {order_id_short}... - {sku} x {qty}\n"
+                f"      Total: ${total:.2f} - Estado: {status}"
             )
     else:
         print("   No hay pedidos en el historial")
@@ -219,11 +283,12 @@ def demo_customer_history(facade: OrderFacade) -> None:
 
     if history2:
         for i, order in enumerate(history2, 1):
+            order_id_short = order["order_id"][:8]
+            sku, qty = order["sku"], order["qty"]
+            total, status = order["total_amount"], order["status"]
             print(
-                f"   {i}. Pedido {order['order_id'][:8]}... - {order['sku']} x {order['qty']}"
-            )
-            print(
-                f"      Total: ${order['total_amount']:.2f} - Estado: {order['status']}"
+                f"   {i}. Pedido {order_id_short}... - {sku} x {qty}\n"
+                f"      Total: ${total:.2f} - Estado: {status}"
             )
     else:
         print("   No hay pedidos en el historial")
@@ -235,37 +300,52 @@ def demo_system_statistics(facade: OrderFacade) -> None:
 
     stats = facade.get_system_stats()
 
-    print("\n📈 Estadísticas Generales:")
-    print(f"   Pedidos exitosos: {stats['total_successful_orders']}")
-    print(f"   Pedidos fallidos: {stats['total_failed_orders']}")
-    print(f"   Tasa de éxito: {stats['success_rate_percentage']:.2f}%")
+    sys.stdout.write(
+        "\n📈 Estadísticas Generales:\n"
+        f"   Pedidos exitosos: {stats['total_successful_orders']}\n"
+        f"   Pedidos fallidos: {stats['total_failed_orders']}\n"
+        f"   Tasa de éxito: {stats['success_rate_percentage']:.2f}%\n"
+    )
 
     print("\n📦 Estado del Inventario:")
     inventory = stats["inventory_status"]
-    for sku, quantity in inventory.items():
-        status = "⚠️  BAJO STOCK" if quantity <= 2 else "✅ DISPONIBLE"
-        print(f"   {sku}: {quantity} unidades - {status}")
+    print(
+        "\n".join(
+            f"   {sku}: {quantity} unidades - "
+            f"{'⚠️  BAJO STOCK' if quantity <= 2 else '✅ DISPONIBLE'}"
+            for sku, quantity in inventory.items()
+        )
+    )
 
     print("\n🚚 Carriers Disponibles:")
     carriers = stats["available_carriers"]
-    for carrier_type, info in carriers.items():
-        print(
-            f"   {carrier_type.capitalize()}: {info['name']} ({info['days']} días, ${info['cost']:.2f})"
+    print(
+        "\n".join(
+            f"   {carrier_type.capitalize()}: {info['name']} "
+            f"({info['days']} días, ${info['cost']:.2f})"
+            for carrier_type, info in carriers.items()
         )
+    )
 
     print("\n📧 Estadísticas de Notificaciones:")
     notif_stats = stats["notification_stats"]
     if notif_stats["total"] > 0:
         print(f"   Total de notificaciones enviadas: {notif_stats['total']}")
         print("   Por canal:")
-        for channel, count in notif_stats["by_channel"].items():
-            print(f"     {channel}: {count}")
+        print(
+            "\n".join(
+                f"     {channel}: {count}"
+                for channel, count in notif_stats["by_channel"].items()
+            )
+        )
     else:
         print("   No hay notificaciones registradas")
 
 
 def demo_notification_preferences(facade: OrderFacade) -> None:
     """Demuestra la configuración de preferencias de notificación."""
+    from order_facade.services.notifications import NotificationChannel
+
     print_separator("DEMO 6: PREFERENCIAS DE NOTIFICACIÓN")
 
     print("\n🔔 Configurando preferencias de notificación...")
@@ -297,7 +377,7 @@ def interactive_demo() -> OrderFacade:
     """Demostración interactiva del sistema."""
     print_separator("DEMOSTRACIÓN INTERACTIVA")
 
-    facade = OrderFacade()
+    facade = _make_facade()
 
     print("\n¡Bienvenido a la demostración interactiva del Order Facade!")
     print("\nEste sistema demuestra el patrón Facade orquestando:")
@@ -306,27 +386,27 @@ def interactive_demo() -> OrderFacade:
     print("• 🚚 Servicio de Envíos")
     print("• 📧 Servicio de Notificaciones")
 
-    input("\nPresiona Enter para continuar...")
+    _pause("\nPresiona Enter para continuar...")
 
     # Demo 1: Pedidos exitosos
     successful_orders = demo_successful_orders(facade)
-    input("\nPresiona Enter para continuar con los errores...")
+    _pause("\nPresiona Enter para continuar con los errores...")
 
     # Demo 2: Manejo de errores
     demo_failed_orders(facade)
-    input("\nPresiona Enter para continuar con la gestión...")
+    _pause("\nPresiona Enter para continuar con la gestión...")
 
     # Demo 3: Gestión de pedidos
     demo_order_management(facade, successful_orders)
-    input("\nPresiona Enter para ver el historial...")
+    _pause("\nPresiona Enter para ver el historial...")
 
     # Demo 4: Historial de clientes
     demo_customer_history(facade)
-    input("\nPresiona Enter para ver las estadísticas...")
+    _pause("\nPresiona Enter para ver las estadísticas...")
 
     # Demo 5: Estadísticas del sistema
     demo_system_statistics(facade)
-    input("\nPresiona Enter para configurar notificaciones...")
+    _pause("\nPresiona Enter para configurar notificaciones...")
 
     # Demo 6: Preferencias de notificación
     demo_notification_preferences(facade)
@@ -347,7 +427,7 @@ def automated_demo() -> OrderFacade:
     """Demostración automatizada sin interacción del usuario."""
     print_separator("DEMOSTRACIÓN AUTOMATIZADA DEL PATRÓN FACADE")
 
-    facade = OrderFacade()
+    facade = _make_facade()
 
     print("\n🚀 Ejecutando demostración automatizada...")
     print("Mostrando el patrón Facade en acción...")
@@ -377,6 +457,9 @@ def automated_demo() -> OrderFacade:
 
 def main() -> None:
     """Función principal del script de demostración."""
+    # Los subsistemas registran su actividad con logging; se muestra en stdout
+    # para que quede en orden junto a la narrativa del demo
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
     if len(sys.argv) > 1 and sys.argv[1] == "--interactive":
         facade = interactive_demo()
     else:
@@ -399,4 +482,11 @@ def main() -> None:
 
 
 if __name__ == "__main__":
+    # Agregar el directorio src al path solo si el paquete no es importable
+    # (p. ej. `python -m src.order_facade.demo` sin `pip install -e .`)
+    import importlib.util
+
+    if importlib.util.find_spec("order_facade") is None:
+        sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
     main()
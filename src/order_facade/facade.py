@@ -7,16 +7,33 @@ de creación de pedidos en sistemas empresariales.
 """
 
 from .services.inventory import InventoryService
-from .services.payments import PaymentGateway
-from .services.shipping import ShippingService
+from .services.payments import PaymentGateway, PaymentReceipt
+from .services.shipping import ShippingService, ShipmentInfo, _DATACLASS_SLOTS
 from .services.notifications import NotificationService, NotificationChannel
+from collections import deque
 from dataclasses import dataclass
-from typing import Optional, Dict, List
-from decimal import Decimal
+from datetime import datetime
+from functools import lru_cache, partial
+from typing import Deque, Optional, Dict, List, Tuple, Union
+from decimal import ROUND_HALF_UP, Decimal
+import asyncio
+import logging
+import time
 import uuid
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+# Resolución (en segundos) con la que se reutilizan los timestamps de auditoría
+_TIMESTAMP_RESOLUTION = 0.001
+
+
+def _to_cents(amount: float, qty: int = 1) -> int:
+    """Convierte qty * amount a centavos redondeando una sola vez, half-up."""
+    cents = Decimal(str(amount)) * qty * 100
+    return int(cents.to_integral_value(rounding=ROUND_HALF_UP))
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class OrderResult:
     """Resultado de una operación de pedido."""
 
@@ -41,6 +58,12 @@ class OrderFacade:
     - Notificaciones: comunicación con clientes
     """
 
+    # Máximo de registros retenidos por historial (los más antiguos se descartan)
+    MAX_HISTORY = 10_000
+
+    # (instante monotónico, timestamp ISO) del último timestamp generado
+    _timestamp_cache: Tuple[float, str] = (float("-inf"), "")
+
     def __init__(
         self,
         inventory: Optional[InventoryService] = None,
@@ -62,9 +85,22 @@ class OrderFacade:
         self.shipping = shipping or ShippingService()
         self.notifications = notifications or NotificationService()
 
-        # Estado interno para auditoría
-        self._order_history: list[Dict] = []
-        self._failed_orders: list[Dict] = []
+        # Estado interno para auditoría, acotado a MAX_HISTORY registros
+        self._order_history: Deque[Dict] = deque(maxlen=self.MAX_HISTORY)
+        self._failed_orders: Deque[Dict] = deque(maxlen=self.MAX_HISTORY)
+        # Contadores acumulados (no se ven afectados por el descarte)
+        self._total_successful = 0
+        self._total_failed = 0
+
+        # Memo de costos de envío por (sku, qty, shipping_type); usar
+        # self._cached_shipping_cost.cache_clear() si cambian las tarifas
+        self._cached_shipping_cost = lru_cache(maxsize=4096)(
+            self._compute_shipping_cost
+        )
+
+        # Índices para búsquedas O(1) sobre el historial
+        self._order_index: Dict[str, Dict] = {}
+        self._customer_index: Dict[str, Deque[Dict]] = {}
 
     def place_order(
         self,
@@ -93,100 +129,26 @@ class OrderFacade:
         """
         order_id = str(uuid.uuid4())
 
-        print(f"\\n=== Procesando Pedido {order_id[:8]}... ===")
-        print(f"Cliente: {customer_id}")
-        print(f"Producto: {sku} x {qty}")
-        print(f"Precio unitario: ${unit_price:.2f}")
-
         try:
-            # 1. Validar y reservar inventario
-            print(f"\\n[Paso 1] Verificando inventario...")
-            if not self.inventory.check_stock(sku, qty):
-                result = OrderResult(
-                    success=False, order_id=order_id, reason="Stock insuficiente"
-                )
-                self._record_failed_order(
-                    order_id, result.reason or "Error desconocido", customer_id
-                )
-                return result
-
-            reserved = self.inventory.reserve(sku, qty)
-            if not reserved:
-                result = OrderResult(
-                    success=False,
-                    order_id=order_id,
-                    reason="No se pudo reservar el stock",
-                )
-                self._record_failed_order(
-                    order_id, result.reason or "Error desconocido", customer_id
-                )
-                return result
-
-            # 2. Calcular total y procesar pago
-            print(f"\\n[Paso 2] Procesando pago...")
-            total_amount = Decimal(str(qty * unit_price))
-
-            # Agregar costo de envío
-            shipping_cost = self.shipping.calculate_shipping_cost(
-                [{"sku": sku, "qty": qty, "weight": 1}], shipping_type
-            )
-            total_amount += Decimal(str(shipping_cost))
-
-            print(f"Subtotal productos: ${qty * unit_price:.2f}")
-            print(f"Costo envío: ${shipping_cost:.2f}")
-            print(f"Total: ${total_amount:.2f}")
-
-            receipt = self.payments.charge(payment_info, float(total_amount))
-            if not receipt.success:
-                # Revertir reserva de inventario
-                self.inventory.release(sku, qty)
-                result = OrderResult(
-                    success=False,
-                    order_id=order_id,
-                    reason=f"Error en el pago: {receipt.message}",
-                )
-                self._record_failed_order(
-                    order_id, result.reason or "Error desconocido", customer_id
-                )
-
-                # Notificar falla en el pago
-                self.notifications.send_order_notification(
-                    customer_id,
-                    "payment_failed",
-                    {"order_id": order_id, "reason": receipt.message},
-                )
-
-                return result
-
-            # 3. Crear envío
-            print(f"\\n[Paso 3] Programando envío...")
-            shipment = self.shipping.create_shipment(
-                customer_id, [{"sku": sku, "qty": qty}], shipping_address, shipping_type
+            outcome = self._process_until_shipment(
+                order_id,
+                customer_id,
+                sku,
+                qty,
+                payment_info,
+                unit_price,
+                shipping_address,
+                shipping_type,
             )
-
-            if not shipment.success:
-                # Revertir inventario (simular reembolso)
-                self.inventory.release(sku, qty)
-                result = OrderResult(
-                    success=False,
-                    order_id=order_id,
-                    reason=f"Error en el envío: {shipment.message}",
-                    transaction_id=receipt.transaction_id,
-                )
-                self._record_failed_order(
-                    order_id, result.reason or "Error desconocido", customer_id
-                )
-                return result
+            if isinstance(outcome, OrderResult):
+                return outcome
+            total_amount, receipt, shipment = outcome
 
             # 4. Notificar al cliente
-            print(f"\\n[Paso 4] Enviando notificaciones...")
-            notification_data = {
-                "order_id": order_id,
-                "amount": float(total_amount),
-                "transaction_id": receipt.transaction_id,
-                "tracking_number": shipment.tracking_number,
-                "eta": shipment.estimated_delivery,
-            }
+            logger.debug("[Paso 4] Enviando notificaciones...")
+            notification_data = self._build_notification_data(
+                order_id, total_amount, receipt, shipment
+            )
 
             # Notificación de confirmación
             self.notifications.send_order_notification(
@@ -201,49 +163,274 @@ class OrderFacade:
                 customer_id, "order_shipped", notification_data
             )
 
-            # Crear resultado exitoso
-            result = OrderResult(
-                success=True,
-                order_id=order_id,
-                transaction_id=receipt.transaction_id,
-                shipment_id=shipment.shipment_id,
-                tracking_number=shipment.tracking_number,
-                total_amount=total_amount,
-                estimated_delivery=shipment.estimated_delivery,
+            return self._complete_order(
+                order_id, customer_id, sku, qty, total_amount, receipt, shipment
             )
 
-            # Registrar pedido exitoso
-            self._record_successful_order(result, customer_id, sku, qty)
+        except Exception as e:
+            return self._handle_unexpected_error(order_id, customer_id, sku, qty, e)
+
+    async def place_order_async(
+        self,
+        customer_id: str,
+        sku: str,
+        qty: int,
+        payment_info: Dict,
+        unit_price: float,
+        shipping_address: Optional[Dict] = None,
+        shipping_type: str = "standard",
+    ) -> OrderResult:
+        """
+        Versión asíncrona de place_order.
 
-            print(f"\\n✅ Pedido {order_id[:8]}... procesado exitosamente!")
-            print(f"Número de seguimiento: {shipment.tracking_number}")
-            print(f"Entrega estimada: {shipment.estimated_delivery}")
+        Inventario, pago y envío se ejecutan en secuencia (cada paso depende del
+        anterior) en el executor por defecto; las dos notificaciones finales son
+        independientes y se envían de forma concurrente con asyncio.gather.
 
-            return result
+        Args:
+            customer_id: ID único del cliente
+            sku: Código del producto
+            qty: Cantidad solicitada
+            payment_info: Información de pago (tarjeta, etc.)
+            unit_price: Precio unitario del producto
+            shipping_address: Dirección de envío (opcional)
+            shipping_type: Tipo de envío (standard, express, premium)
+
+        Returns:
+            OrderResult con el resultado de la operación
+        """
+        loop = asyncio.get_running_loop()
+        order_id = str(uuid.uuid4())
+
+        try:
+            outcome = await loop.run_in_executor(
+                None,
+                partial(
+                    self._process_until_shipment,
+                    order_id,
+                    customer_id,
+                    sku,
+                    qty,
+                    payment_info,
+                    unit_price,
+                    shipping_address,
+                    shipping_type,
+                ),
+            )
+            if isinstance(outcome, OrderResult):
+                return outcome
+            total_amount, receipt, shipment = outcome
+
+            # 4. Notificar al cliente (confirmación y envío en paralelo)
+            logger.debug("[Paso 4] Enviando notificaciones...")
+            notification_data = self._build_notification_data(
+                order_id, total_amount, receipt, shipment
+            )
+            send = self.notifications.send_order_notification
+            await asyncio.gather(
+                loop.run_in_executor(
+                    None,
+                    partial(
+                        send,
+                        customer_id,
+                        "order_confirmed",
+                        notification_data,
+                        [NotificationChannel.EMAIL, NotificationChannel.SMS],
+                    ),
+                ),
+                loop.run_in_executor(
+                    None,
+                    partial(send, customer_id, "order_shipped", notification_data),
+                ),
+            )
+
+            return self._complete_order(
+                order_id, customer_id, sku, qty, total_amount, receipt, shipment
+            )
 
         except Exception as e:
-            # Manejo de errores inesperados
-            print(
-                f"\\n❌ Error inesperado procesando pedido {order_id[:8]}...: {str(e)}"
+            return self._handle_unexpected_error(order_id, customer_id, sku, qty, e)
+
+    def _process_until_shipment(
+        self,
+        order_id: str,
+        customer_id: str,
+        sku: str,
+        qty: int,
+        payment_info: Dict,
+        unit_price: float,
+        shipping_address: Optional[Dict],
+        shipping_type: str,
+    ) -> Union[OrderResult, Tuple[Decimal, PaymentReceipt, ShipmentInfo]]:
+        """
+        Ejecuta los pasos dependientes del pedido: inventario, pago y envío.
+
+        Returns:
+            OrderResult fallido si algún paso falla, o la tupla
+            (total, recibo de pago, envío) si todos fueron exitosos
+        """
+        logger.debug(
+            "=== Procesando Pedido %s... === Cliente: %s, Producto: %s x %d, "
+            "Precio unitario: $%.2f",
+            order_id[:8],
+            customer_id,
+            sku,
+            qty,
+            unit_price,
+        )
+
+        # 1. Validar y reservar inventario
+        logger.debug("[Paso 1] Verificando inventario...")
+        # reserve() verifica y descuenta el stock en una sola operación atómica
+        if not self.inventory.reserve(sku, qty):
+            result = OrderResult(
+                success=False, order_id=order_id, reason="Stock insuficiente"
+            )
+            self._record_failed_order(
+                order_id, result.reason or "Error desconocido", customer_id
             )
+            return result
 
-            # Intentar revertir cambios
-            try:
-                self.inventory.release(sku, qty)
-            except Exception as rollback_error:  # noqa: B110
-                print(f"Warning: Failed to rollback inventory: {rollback_error}")
+        # 2. Calcular total y procesar pago
+        logger.debug("[Paso 2] Procesando pago...")
+        # Aritmética en centavos enteros; se redondea después de multiplicar
+        subtotal_cents = _to_cents(unit_price, qty)
+        shipping_cents = self._cached_shipping_cost(sku, qty, shipping_type)
+        total_cents = subtotal_cents + shipping_cents
+
+        logger.debug(
+            "Subtotal productos: $%.2f, Costo envío: $%.2f, Total: $%.2f",
+            subtotal_cents / 100,
+            shipping_cents / 100,
+            total_cents / 100,
+        )
 
+        receipt = self.payments.charge(payment_info, total_cents / 100)
+        if not receipt.success:
+            # Revertir reserva de inventario
+            self.inventory.release(sku, qty)
             result = OrderResult(
                 success=False,
                 order_id=order_id,
-                reason=f"Error interno del sistema: {str(e)}",
+                reason=f"Error en el pago: {receipt.message}",
             )
             self._record_failed_order(
                 order_id, result.reason or "Error desconocido", customer_id
             )
 
+            # Notificar falla en el pago
+            self.notifications.send_order_notification(
+                customer_id,
+                "payment_failed",
+                {"order_id": order_id, "reason": receipt.message},
+            )
+
+            return result
+
+        # 3. Crear envío
+        logger.debug("[Paso 3] Programando envío...")
+        shipment = self.shipping.create_shipment(
+            customer_id, [{"sku": sku, "qty": qty}], shipping_address, shipping_type
+        )
+
+        if not shipment.success:
+            # Revertir inventario (simular reembolso)
+            self.inventory.release(sku, qty)
+            result = OrderResult(
+                success=False,
+                order_id=order_id,
+                reason=f"Error en el envío: {shipment.message}",
+                transaction_id=receipt.transaction_id,
+            )
+            self._record_failed_order(
+                order_id, result.reason or "Error desconocido", customer_id
+            )
             return result
 
+        return Decimal(total_cents).scaleb(-2), receipt, shipment
+
+    def _compute_shipping_cost(self, sku: str, qty: int, shipping_type: str) -> int:
+        """Calcula el costo de envío de una línea de pedido, en centavos."""
+        cost = self.shipping.calculate_shipping_cost(
+            [{"sku": sku, "qty": qty, "weight": 1}], shipping_type
+        )
+        return _to_cents(cost)
+
+    def _build_notification_data(
+        self,
+        order_id: str,
+        total_amount: Decimal,
+        receipt: PaymentReceipt,
+        shipment: ShipmentInfo,
+    ) -> Dict:
+        """Construye los datos usados por las plantillas de notificación."""
+        return {
+            "order_id": order_id,
+            "amount": float(total_amount),
+            "transaction_id": receipt.transaction_id,
+            "tracking_number": shipment.tracking_number,
+            "eta": shipment.estimated_delivery,
+        }
+
+    def _complete_order(
+        self,
+        order_id: str,
+        customer_id: str,
+        sku: str,
+        qty: int,
+        total_amount: Decimal,
+        receipt: PaymentReceipt,
+        shipment: ShipmentInfo,
+    ) -> OrderResult:
+        """Crea y registra el resultado de un pedido exitoso."""
+        result = OrderResult(
+            success=True,
+            order_id=order_id,
+            transaction_id=receipt.transaction_id,
+            shipment_id=shipment.shipment_id,
+            tracking_number=shipment.tracking_number,
+            total_amount=total_amount,
+            estimated_delivery=shipment.estimated_delivery,
+        )
+
+        # Registrar pedido exitoso
+        self._record_successful_order(result, customer_id, sku, qty)
+
+        logger.info(
+            "✅ Pedido %s... procesado exitosamente (inventario, pago, envío, "
+            "notificaciones). Número de seguimiento: %s. Entrega estimada: %s",
+            order_id[:8],
+            shipment.tracking_number,
+            shipment.estimated_delivery,
+        )
+
+        return result
+
+    def _handle_unexpected_error(
+        self, order_id: str, customer_id: str, sku: str, qty: int, error: Exception
+    ) -> OrderResult:
+        """Revierte el inventario y registra un pedido fallido por error inesperado."""
+        logger.error(
+            "❌ Error inesperado procesando pedido %s...: %s", order_id[:8], error
+        )
+
+        # Intentar revertir cambios
+        try:
+            self.inventory.release(sku, qty)
+        except Exception as rollback_error:  # noqa: B110
+            logger.warning("Failed to rollback inventory: %s", rollback_error)
+
+        result = OrderResult(
+            success=False,
+            order_id=order_id,
+            reason=f"Error interno del sistema: {str(error)}",
+        )
+        self._record_failed_order(
+            order_id, result.reason or "Error desconocido", customer_id
+        )
+
+        return result
+
     def cancel_order(self, order_id: str, customer_id: str) -> bool:
         """
         Cancela un pedido existente.
@@ -255,12 +442,12 @@ class OrderFacade:
         Returns:
             True si la cancelación fue exitosa
         """
-        print(f"\\n=== Cancelando Pedido {order_id[:8]}... ===")
+        logger.debug("=== Cancelando Pedido %s... ===", order_id[:8])
 
         # Buscar el pedido en el historial
         order = self._find_order_in_history(order_id)
         if not order:
-            print(f"❌ Pedido {order_id[:8]}... no encontrado")
+            logger.warning("❌ Pedido %s... no encontrado", order_id[:8])
             return False
 
         try:
@@ -273,7 +460,7 @@ class OrderFacade:
                 refund_receipt = self.payments.refund(
                     order["transaction_id"], float(order["total_amount"])
                 )
-                print(f"Reembolso procesado: {refund_receipt.success}")
+                logger.debug("Reembolso procesado: %s", refund_receipt.success)
 
             # Restaurar inventario
             if order.get("sku") and order.get("qty"):
@@ -285,11 +472,11 @@ class OrderFacade:
                 f"Tu pedido {order_id[:8]}... ha sido cancelado exitosamente. El reembolso será procesado en 3-5 días hábiles.",
             )
 
-            print(f"✅ Pedido {order_id[:8]}... cancelado exitosamente")
+            logger.info("✅ Pedido %s... cancelado exitosamente", order_id[:8])
             return True
 
         except Exception as e:
-            print(f"❌ Error cancelando pedido: {str(e)}")
+            logger.error("❌ Error cancelando pedido: %s", e)
             return False
 
     def get_order_status(self, order_id: str) -> Optional[Dict]:
@@ -323,11 +510,7 @@ class OrderFacade:
         Returns:
             Lista de pedidos del cliente
         """
-        return [
-            order
-            for order in self._order_history
-            if order["customer_id"] == customer_id
-        ]
+        return list(self._customer_index.get(customer_id, ()))
 
     def get_system_stats(self) -> Dict:
         """
@@ -336,8 +519,8 @@ class OrderFacade:
         Returns:
             Diccionario con estadísticas generales
         """
-        total_orders = len(self._order_history)
-        failed_orders = len(self._failed_orders)
+        total_orders = self._total_successful
+        failed_orders = self._total_failed
         success_rate = (
             (total_orders / (total_orders + failed_orders)) * 100
             if (total_orders + failed_orders) > 0
@@ -353,14 +536,18 @@ class OrderFacade:
             "success_rate_percentage": round(success_rate, 2),
             "inventory_status": self.inventory.list_products(),
             "notification_stats": notification_stats,
-            "available_carriers": self.shipping.get_available_carriers(),
+            # Copia en dicts planos: los mappingproxy no se serializan a JSON
+            "available_carriers": {
+                carrier: dict(info)
+                for carrier, info in self.shipping.get_available_carriers().items()
+            },
         }
 
     def _record_successful_order(
         self, result: OrderResult, customer_id: str, sku: str, qty: int
     ) -> None:
         """Registra un pedido exitoso en el historial."""
-        order_record = {
+        order_record: Dict = {
             "order_id": result.order_id,
             "customer_id": customer_id,
             "sku": sku,
@@ -373,7 +560,20 @@ class OrderFacade:
             "status": "completed",
             "timestamp": self._get_current_timestamp(),
         }
-        self._order_history.append(order_record)
+        history = self._order_history
+        if len(history) == history.maxlen:
+            # Mantener los índices sincronizados con el registro que se descarta
+            evicted = history[0]
+            self._order_index.pop(evicted["order_id"], None)
+            bucket = self._customer_index[evicted["customer_id"]]
+            bucket.popleft()
+            if not bucket:
+                del self._customer_index[evicted["customer_id"]]
+
+        history.append(order_record)
+        self._order_index[order_record["order_id"]] = order_record
+        self._customer_index.setdefault(customer_id, deque()).append(order_record)
+        self._total_successful += 1
 
     def _record_failed_order(
         self, order_id: str, reason: str, customer_id: str
@@ -386,16 +586,17 @@ class OrderFacade:
             "timestamp": self._get_current_timestamp(),
         }
         self._failed_orders.append(failed_record)
+        self._total_failed += 1
 
     def _find_order_in_history(self, order_id: str) -> Optional[Dict]:
         """Busca un pedido en el historial."""
-        for order in self._order_history:
-            if order["order_id"] == order_id:
-                return order
-        return None
+        return self._order_index.get(order_id)
 
     def _get_current_timestamp(self) -> str:
-        """Obtiene el timestamp actual."""
-        from datetime import datetime
-
-        return datetime.now().isoformat()
+        """Obtiene el timestamp actual, reutilizado dentro de una ventana de 1 ms."""
+        now = time.monotonic()
+        cached_at, cached_value = OrderFacade._timestamp_cache
+        if now - cached_at > _TIMESTAMP_RESOLUTION:
+            cached_value = datetime.now().isoformat()
+            OrderFacade._timestamp_cache = (now, cached_value)
+        return cached_value
@@ -5,7 +5,12 @@ Este módulo maneja la verificación de stock y las reservas de productos
 en el sistema de inventario.
 """
 
-from typing import Dict
+import logging
+import threading
+from array import array
+from typing import Dict, Iterable, Tuple
+
+logger = logging.getLogger(__name__)
 
 
 class InventoryService:
@@ -13,14 +18,40 @@ class InventoryService:
 
     def __init__(self) -> None:
         """Inicializa el servicio con stock simulado."""
-        # Stock simulado: sku -> cantidad
-        self._stock: Dict[str, int] = {
+        # Stock simulado en un arreglo contiguo de enteros; sku -> posición
+        initial_stock = {
             "MONITOR-27": 10,
             "WASHER-7KG": 2,
             "LAPTOP-15": 5,
             "SMARTPHONE-X": 8,
             "TABLET-10": 3,
         }
+        self._sku_index: Dict[str, int] = {
+            sku: i for i, sku in enumerate(initial_stock)
+        }
+        self._stock_arr = array("q", initial_stock.values())
+        # Protege las secuencias leer-comparar-escribir sobre el arreglo
+        self._lock = threading.Lock()
+
+    def add_product(self, sku: str, qty: int) -> None:
+        """
+        Registra un producto o fija su stock disponible.
+
+        Args:
+            sku: Código del producto
+            qty: Cantidad disponible
+        """
+        with self._lock:
+            self._set_stock(sku, qty)
+
+    def _set_stock(self, sku: str, qty: int) -> None:
+        """Fija el stock de un SKU; el llamador debe tener el lock."""
+        index = self._sku_index.get(sku)
+        if index is None:
+            self._sku_index[sku] = len(self._stock_arr)
+            self._stock_arr.append(qty)
+        else:
+            self._stock_arr[index] = qty
 
     def check_stock(self, sku: str, qty: int) -> bool:
         """
@@ -33,7 +64,10 @@ class InventoryService:
         Returns:
             True si hay suficiente stock, False en caso contrario
         """
-        return self._stock.get(sku, 0) >= qty
+        index = self._sku_index.get(sku)
+        if index is None:
+            return qty <= 0
+        return self._stock_arr[index] >= qty
 
     def reserve(self, sku: str, qty: int) -> bool:
         """
@@ -46,17 +80,56 @@ class InventoryService:
         Returns:
             True si la reserva fue exitosa, False en caso contrario
         """
-        if self.check_stock(sku, qty):
-            self._stock[sku] -= qty
-            print(
-                f"[Inventory] Reservados {qty} unidades de {sku}. Stock restante: {self._stock[sku]}"
+        with self._lock:
+            index = self._sku_index.get(sku)
+            available = 0 if index is None else self._stock_arr[index]
+            reserved = False
+            if index is not None and available >= qty:
+                self._stock_arr[index] = available - qty
+                reserved = True
+
+        if reserved:
+            logger.info(
+                "[Inventory] Reservados %d unidades de %s. Stock restante: %d",
+                qty,
+                sku,
+                available - qty,
             )
             return True
-        print(
-            f"[Inventory] No se pudo reservar {qty} unidades de {sku}. Stock disponible: {self._stock.get(sku, 0)}"
+        logger.info(
+            "[Inventory] No se pudo reservar %d unidades de %s. Stock disponible: %d",
+            qty,
+            sku,
+            available,
         )
         return False
 
+    def reserve_many(self, items: Iterable[Tuple[str, int]]) -> bool:
+        """
+        Reserva varias líneas de pedido de forma todo-o-nada.
+
+        Args:
+            items: Pares (sku, cantidad) a reservar
+
+        Returns:
+            True si todas las líneas se reservaron, False si alguna no tenía stock
+        """
+        stock = self._stock_arr
+        requested: Dict[int, int] = {}
+        for sku, qty in items:
+            index = self._sku_index.get(sku)
+            if index is None:
+                return False
+            requested[index] = requested.get(index, 0) + qty
+
+        with self._lock:
+            if any(stock[index] < qty for index, qty in requested.items()):
+                return False
+            for index, qty in requested.items():
+                stock[index] -= qty
+        logger.info("[Inventory] Reservadas %d líneas de pedido", len(requested))
+        return True
+
     def release(self, sku: str, qty: int) -> None:
         """
         Libera productos previamente reservados.
@@ -65,9 +138,19 @@ class InventoryService:
             sku: Código del producto
             qty: Cantidad a liberar
         """
-        self._stock[sku] = self._stock.get(sku, 0) + qty
-        print(
-            f"[Inventory] Liberados {qty} unidades de {sku}. Stock actual: {self._stock[sku]}"
+        with self._lock:
+            index = self._sku_index.get(sku)
+            if index is None:
+                self._set_stock(sku, qty)
+                current = qty
+            else:
+                current = self._stock_arr[index] + qty
+                self._stock_arr[index] = current
+        logger.info(
+            "[Inventory] Liberados %d unidades de %s. Stock actual: %d",
+            qty,
+            sku,
+            current,
         )
 
     def get_current_stock(self, sku: str) -> int:
@@ -80,7 +163,8 @@ class InventoryService:
         Returns:
             Cantidad disponible en stock
         """
-        return self._stock.get(sku, 0)
+        index = self._sku_index.get(sku)
+        return 0 if index is None else self._stock_arr[index]
 
     def list_products(self) -> Dict[str, int]:
         """
@@ -89,4 +173,5 @@ class InventoryService:
         Returns:
             Diccionario con productos y su stock
         """
-        return self._stock.copy()
+        stock = self._stock_arr
+        return {sku: stock[index] for sku, index in self._sku_index.items()}
@@ -5,9 +5,26 @@ Este módulo maneja el envío de notificaciones por diferentes canales
 como email, SMS y push notifications.
 """
 
-from typing import Dict, List, Optional, Union
+from array import array
+from collections import Counter, deque
+from typing import (
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 from datetime import datetime
 from enum import Enum
+import asyncio
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
 
 
 class NotificationChannel(Enum):
@@ -19,13 +36,49 @@ class NotificationChannel(Enum):
     IN_APP = "in_app"
 
 
+# Preferencia por defecto compartida (inmutable) para clientes sin configuración
+_DEFAULT_CHANNELS: Tuple[NotificationChannel, ...] = (NotificationChannel.EMAIL,)
+
+# Codificación entera de los canales para los contadores de estadísticas
+_CHANNELS: Tuple[NotificationChannel, ...] = tuple(NotificationChannel)
+_CHANNEL_CODES: Dict[NotificationChannel, int] = {
+    channel: code for code, channel in enumerate(_CHANNELS)
+}
+
+
 class NotificationService:
     """Servicio de notificaciones multi-canal."""
 
+    # Máximo de notificaciones retenidas en el historial
+    MAX_HISTORY = 10_000
+
     def __init__(self) -> None:
         """Inicializa el servicio con configuración de canales."""
-        self._sent_notifications: list[Dict] = []
-        self._customer_preferences: dict[str, List[NotificationChannel]] = {}
+        # Historial de envíos en columnas paralelas (una fila por notificación),
+        # acotado a MAX_HISTORY filas. Las listas dan acceso O(1) por índice:
+        # _base_row es la fila absoluta en la posición 0 y _evicted_rows cuenta
+        # las ya descartadas; el prefijo descartado se compacta por bloques
+        self._sent_customers: List[str] = []
+        self._sent_messages: List[str] = []
+        self._sent_channels: List[str] = []
+        self._sent_timestamps: List[str] = []
+        self._base_row = 0
+        self._evicted_rows = 0
+        # Índice cliente -> filas absolutas del historial, para consultas O(k)
+        self._rows_by_customer: Dict[str, Deque[int]] = {}
+        # Contadores acumulados para las estadísticas
+        self._channel_counts = array("Q", [0] * len(_CHANNELS))
+        self._customer_counts: Counter = Counter()
+        # Las columnas deben crecer juntas aunque notify() se llame desde hilos
+        self._history_lock = threading.Lock()
+        self._customer_preferences: Dict[str, Tuple[NotificationChannel, ...]] = {}
+        # Tabla de despacho canal -> función de envío
+        self._dispatch: Dict[NotificationChannel, Callable[[str, str], None]] = {
+            NotificationChannel.EMAIL: self._send_email,
+            NotificationChannel.SMS: self._send_sms,
+            NotificationChannel.PUSH: self._send_push,
+            NotificationChannel.IN_APP: self._send_in_app,
+        }
 
         # Plantillas de notificación
         self._templates = {
@@ -47,6 +100,14 @@ class NotificationService:
             },
         }
 
+        # Plantillas precompiladas: (asunto, mensaje) como callables format_map
+        self._compiled_templates: Dict[
+            str, Tuple[Callable[[Mapping], str], Callable[[Mapping], str]]
+        ] = {
+            name: (template["subject"].format_map, template["message"].format_map)
+            for name, template in self._templates.items()
+        }
+
     def notify(
         self,
         customer_id: str,
@@ -65,32 +126,112 @@ class NotificationService:
             True si la notificación fue enviada exitosamente
         """
         try:
-            notification = {
-                "customer_id": customer_id,
-                "message": message,
-                "channel": channel.value,
-                "timestamp": datetime.now().isoformat(),
-                "status": "sent",
-            }
-
-            self._sent_notifications.append(notification)
-
-            # Simular envío según el canal
-            if channel == NotificationChannel.EMAIL:
-                print(f"[Email] to {customer_id}: {message}")
-            elif channel == NotificationChannel.SMS:
-                print(f"[SMS] to {customer_id}: {message}")
-            elif channel == NotificationChannel.PUSH:
-                print(f"[Push] to {customer_id}: {message}")
-            else:
-                print(f"[In-App] to {customer_id}: {message}")
-
+            self._record_sent(((channel, customer_id, message),))
+            self._dispatch[channel](customer_id, message)
             return True
 
         except Exception as e:
-            print(f"[Notification Error] Failed to send to {customer_id}: {str(e)}")
+            logger.error(
+                "[Notification Error] Failed to send to %s: %s", customer_id, e
+            )
             return False
 
+    def _send_batch(
+        self, entries: Sequence[Tuple[NotificationChannel, str, str]]
+    ) -> List[bool]:
+        """
+        Registra un lote de envíos con un solo lock y luego los despacha.
+
+        Cada entrada tiene su propio resultado: un canal inválido o un fallo
+        al despachar solo afecta a esa entrada, como en notify().
+        """
+        handlers: List[Optional[Callable[[str, str], None]]] = []
+        for channel, customer_id, _ in entries:
+            try:
+                handlers.append(self._dispatch[channel])
+            except (KeyError, TypeError) as e:
+                logger.error(
+                    "[Notification Error] Failed to send to %s: %s", customer_id, e
+                )
+                handlers.append(None)
+
+        self._record_sent(
+            [entry for entry, handler in zip(entries, handlers) if handler]
+        )
+
+        outcomes = []
+        for (_, customer_id, message), handler in zip(entries, handlers):
+            if handler is None:
+                outcomes.append(False)
+                continue
+            try:
+                handler(customer_id, message)
+                outcomes.append(True)
+            except Exception as e:
+                logger.error(
+                    "[Notification Error] Failed to send to %s: %s", customer_id, e
+                )
+                outcomes.append(False)
+        return outcomes
+
+    def _record_sent(
+        self, entries: Sequence[Tuple[NotificationChannel, str, str]]
+    ) -> None:
+        """Registra un grupo de envíos en el historial con un solo lock."""
+        timestamp = datetime.now().isoformat()
+        with self._history_lock:
+            row = self._base_row + len(self._sent_customers)
+            for channel, customer_id, message in entries:
+                # Resolver el canal antes de tocar las columnas: un canal inválido
+                # debe fallar sin dejarlas con longitudes distintas
+                channel_value = channel.value
+                channel_code = _CHANNEL_CODES[channel]
+                if row - self._evicted_rows >= self.MAX_HISTORY:
+                    self._evict_oldest()
+                self._rows_by_customer.setdefault(customer_id, deque()).append(row)
+                self._sent_customers.append(customer_id)
+                self._sent_messages.append(message)
+                self._sent_channels.append(channel_value)
+                self._sent_timestamps.append(timestamp)
+                self._channel_counts[channel_code] += 1
+                self._customer_counts[customer_id] += 1
+                row += 1
+
+    def _evict_oldest(self) -> None:
+        """Descarta la fila más antigua del historial; el llamador tiene el lock."""
+        customer_id = self._sent_customers[self._evicted_rows - self._base_row]
+        self._evicted_rows += 1
+        rows = self._rows_by_customer[customer_id]
+        rows.popleft()
+        if not rows:
+            del self._rows_by_customer[customer_id]
+
+        # Compactar cuando el prefijo descartado alcanza MAX_HISTORY filas:
+        # costo amortizado O(1) por fila y memoria acotada a 2 * MAX_HISTORY
+        dead = self._evicted_rows - self._base_row
+        if dead >= self.MAX_HISTORY:
+            del self._sent_customers[:dead]
+            del self._sent_messages[:dead]
+            del self._sent_channels[:dead]
+            del self._sent_timestamps[:dead]
+            self._base_row = self._evicted_rows
+
+    def _send_email(self, customer_id: str, message: str) -> None:
+        """Simula el envío por email."""
+        logger.info("[Email] to %s: %s", customer_id, message)
+
+    def _send_sms(self, customer_id: str, message: str) -> None:
+        """Simula el envío por SMS."""
+        logger.info("[SMS] to %s: %s", customer_id, message)
+
+    def _send_push(self, customer_id: str, message: str) -> None:
+        """Simula el envío de una notificación push."""
+        logger.info("[Push] to %s: %s", customer_id, message)
+
+    def _send_in_app(self, customer_id: str, message: str) -> None:
+        """Simula el envío de una notificación dentro de la aplicación."""
+        logger.info("[In-App] to %s: %s", customer_id, message)
+
     def send_order_notification(
         self,
         customer_id: str,
@@ -110,33 +251,38 @@ class NotificationService:
         Returns:
             Diccionario con resultados del envío por canal
         """
-        if notification_type not in self._templates:
+        compiled = self._compiled_templates.get(notification_type)
+        if compiled is None:
             return {"error": f"Tipo de notificación '{notification_type}' no válido"}
 
-        template = self._templates[notification_type]
+        format_subject, format_message = compiled
 
         # Personalizar mensaje con datos del pedido
         try:
-            subject = template["subject"].format(**order_data)
-            message = template["message"].format(**order_data)
+            subject = format_subject(order_data)
+            message = format_message(order_data)
         except KeyError as e:
             return {"error": f"Falta el campo requerido: {str(e)}"}
 
         # Determinar canales a usar
-        if channels is None:
-            channels = self._get_customer_notification_preferences(customer_id)
+        targets: Sequence[NotificationChannel] = (
+            channels
+            if channels is not None
+            else self._get_customer_notification_preferences(customer_id)
+        )
 
         results = {}
 
-        # Enviar por cada canal
-        for channel in channels:
-            success = self.notify(customer_id, f"{subject}\n\n{message}", channel)
+        # Enviar por cada canal; el cuerpo es el mismo para todos
+        body = f"{subject}\n\n{message}"
+        for channel in targets:
+            success = self.notify(customer_id, body, channel)
             results[channel.value] = "success" if success else "failed"
 
         return results
 
     def set_customer_preferences(
-        self, customer_id: str, preferences: List[NotificationChannel]
+        self, customer_id: str, preferences: Sequence[NotificationChannel]
     ) -> None:
         """
         Establece las preferencias de notificación del cliente.
@@ -144,11 +290,19 @@ class NotificationService:
         Args:
             customer_id: ID del cliente
             preferences: Lista de canales preferidos
+
+        Raises:
+            ValueError: Si algún canal no es un NotificationChannel válido
         """
-        self._customer_preferences[customer_id] = preferences
-        print(
-            f"[Notifications] Preferencias actualizadas para {customer_id}: {[p.value for p in preferences]}"
-        )
+        # Se validan y congelan una sola vez; las consultas reutilizan la tupla
+        channels = tuple(NotificationChannel(p) for p in preferences)
+        self._customer_preferences[customer_id] = channels
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "[Notifications] Preferencias actualizadas para %s: %s",
+                customer_id,
+                [p.value for p in channels],
+            )
 
     def get_notification_history(self, customer_id: str) -> List[Dict]:
         """
@@ -160,7 +314,18 @@ class NotificationService:
         Returns:
             Lista de notificaciones enviadas
         """
-        return [n for n in self._sent_notifications if n["customer_id"] == customer_id]
+        with self._history_lock:
+            offset = self._base_row
+            return [
+                {
+                    "customer_id": customer_id,
+                    "message": self._sent_messages[row - offset],
+                    "channel": self._sent_channels[row - offset],
+                    "timestamp": self._sent_timestamps[row - offset],
+                    "status": "sent",
+                }
+                for row in self._rows_by_customer.get(customer_id, ())
+            ]
 
     def send_bulk_notification(
         self,
@@ -179,15 +344,62 @@ class NotificationService:
         Returns:
             Diccionario con estadísticas del envío
         """
+        # Lote local a esta llamada: otros envíos concurrentes no se mezclan
+        outcomes = self._send_batch(
+            [(channel, customer_id, message) for customer_id in customer_ids]
+        )
+        return self._summarize_bulk(customer_ids, outcomes)
+
+    async def send_bulk_notification_async(
+        self,
+        customer_ids: List[str],
+        message: str,
+        channel: NotificationChannel = NotificationChannel.EMAIL,
+        max_concurrency: int = 10,
+    ) -> Dict:
+        """
+        Envía notificación masiva de forma concurrente.
+
+        Cada envío se ejecuta en el executor por defecto y se agenda con
+        asyncio.gather; un semáforo limita los envíos simultáneos. Un fallo en
+        un cliente no aborta el resto del lote.
+
+        Args:
+            customer_ids: Lista de IDs de clientes
+            message: Mensaje a enviar
+            channel: Canal de notificación
+            max_concurrency: Máximo de envíos simultáneos
+
+        Returns:
+            Diccionario con estadísticas del envío
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def send_one(customer_id: str) -> bool:
+            async with semaphore:
+                return await loop.run_in_executor(
+                    None, self.notify, customer_id, message, channel
+                )
+
+        gathered = await asyncio.gather(
+            *(send_one(customer_id) for customer_id in customer_ids),
+            return_exceptions=True,
+        )
+        outcomes = [outcome is True for outcome in gathered]
+        return self._summarize_bulk(customer_ids, outcomes)
+
+    def _summarize_bulk(
+        self, customer_ids: Sequence[str], outcomes: Sequence[bool]
+    ) -> Dict:
+        """Agrega los resultados de un envío masivo."""
         results: Dict[str, Union[int, list]] = {"sent": 0, "failed": 0, "details": []}
 
         sent_count = 0
         failed_count = 0
         details_list: list[Dict] = []
 
-        for customer_id in customer_ids:
-            success = self.notify(customer_id, message, channel)
-
+        for customer_id, success in zip(customer_ids, outcomes):
             if success:
                 sent_count += 1
             else:
@@ -201,14 +413,14 @@ class NotificationService:
         results["failed"] = failed_count
         results["details"] = details_list
 
-        print(
-            f"[Bulk Notification] Enviado: {results['sent']}, Fallidos: {results['failed']}"
+        logger.info(
+            "[Bulk Notification] Enviado: %d, Fallidos: %d", sent_count, failed_count
         )
         return results
 
     def _get_customer_notification_preferences(
         self, customer_id: str
-    ) -> List[NotificationChannel]:
+    ) -> Sequence[NotificationChannel]:
         """
         Obtiene las preferencias de notificación del cliente.
 
@@ -219,7 +431,7 @@ class NotificationService:
             Lista de canales preferidos (por defecto: email)
         """
         preferences = self._customer_preferences.get(customer_id)
-        return preferences if preferences is not None else [NotificationChannel.EMAIL]
+        return preferences if preferences is not None else _DEFAULT_CHANNELS
 
     def get_notification_stats(self) -> Dict:
         """
@@ -228,24 +440,15 @@ class NotificationService:
         Returns:
             Diccionario con estadísticas
         """
-        total_notifications = len(self._sent_notifications)
-
-        if total_notifications == 0:
-            return {"total": 0, "by_channel": {}, "by_customer": {}}
-
-        # Estadísticas por canal
-        by_channel: dict[str, int] = {}
-        by_customer: dict[str, int] = {}
-
-        for notification in self._sent_notifications:
-            channel = notification["channel"]
-            customer = notification["customer_id"]
-
-            by_channel[channel] = by_channel.get(channel, 0) + 1
-            by_customer[customer] = by_customer.get(customer, 0) + 1
-
-        return {
-            "total": total_notifications,
-            "by_channel": by_channel,
-            "by_customer": by_customer,
-        }
+        # Contadores incrementales: no recorren el historial
+        with self._history_lock:
+            channel_counts = self._channel_counts
+            return {
+                "total": sum(channel_counts),
+                "by_channel": {
+                    channel.value: count
+                    for channel, count in zip(_CHANNELS, channel_counts)
+                    if count
+                },
+                "by_customer": dict(self._customer_counts),
+            }
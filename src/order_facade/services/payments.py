@@ -5,11 +5,69 @@ Este módulo maneja el procesamiento de pagos y validación de tarjetas
 de crédito en el sistema.
 """
 
-import uuid
+import logging
+import secrets
 from dataclasses import dataclass
-from typing import Dict, Optional
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
 from decimal import Decimal
 
+logger = logging.getLogger(__name__)
+
+# IDs de transacción internos: 32 caracteres hex aleatorios, sin formato UUID
+_TOKEN = secrets.token_hex
+
+# Luhn: valor de cada dígito duplicado (con los dígitos del resultado sumados)
+_LUHN_DOUBLED = (0, 2, 4, 6, 8, 1, 3, 5, 7, 9)
+
+# Separadores admitidos en el número de tarjeta, eliminados en una sola pasada
+_CARD_SEPARATORS = str.maketrans("", "", " -")
+
+
+# Comportamiento simulado según el primer dígito de la tarjeta:
+# índice = dígito, valor = (aprobada, tipo de tarjeta)
+_CARD_TABLE: Tuple[Tuple[bool, str], ...] = (
+    (False, ""),  # 0
+    (False, ""),  # 1
+    (False, ""),  # 2
+    (False, "Amex"),  # 3 - rechazada
+    (True, "Visa"),  # 4 - éxito
+    (True, "MasterCard"),  # 5 - éxito
+    (False, "Discover"),  # 6 - rechazada
+    (False, ""),  # 7
+    (False, ""),  # 8
+    (False, ""),  # 9
+)
+
+_DECLINED_MESSAGE = "Pago rechazado - Fondos insuficientes o tarjeta bloqueada"
+
+
+@lru_cache(maxsize=65536)
+def _classify_bin(bin6: str) -> Tuple[bool, str, str]:
+    """
+    Clasifica una tarjeta por su BIN (primeros 6 dígitos).
+
+    Returns:
+        Tupla (aprobada, tipo de tarjeta, mensaje del recibo)
+    """
+    first_char = bin6[:1]
+    approved, card_type = (
+        _CARD_TABLE[ord(first_char) - 48] if "0" <= first_char <= "9" else (False, "")
+    )
+    if approved:
+        return True, card_type, f"Pago procesado exitosamente con {card_type}"
+    return False, card_type, _DECLINED_MESSAGE
+
+
+def _luhn(digits: str) -> bool:
+    """Verifica el dígito de control Luhn de una cadena de dígitos."""
+    total = 0
+    odd = len(digits) & 1
+    for i, char in enumerate(digits):
+        digit = ord(char) - 48
+        total += _LUHN_DOUBLED[digit] if (i & 1) == odd else digit
+    return total % 10 == 0
+
 
 @dataclass
 class PaymentReceipt:
@@ -25,16 +83,6 @@ class PaymentReceipt:
 class PaymentGateway:
     """Gateway de pagos para procesar transacciones financieras."""
 
-    def __init__(self) -> None:
-        """Inicializa el gateway con configuración simulada."""
-        # Simulación de diferentes tipos de tarjetas y sus comportamientos
-        self._card_behaviors = {
-            "4": "visa_success",  # Visa - éxito
-            "5": "mastercard_success",  # MasterCard - éxito
-            "3": "amex_decline",  # Amex - rechazada
-            "6": "discover_decline",  # Discover - rechazada
-        }
-
     def charge(self, payment_info: Dict, amount: float) -> PaymentReceipt:
         """
         Procesa un cargo a la tarjeta de crédito.
@@ -46,7 +94,8 @@ class PaymentGateway:
         Returns:
             PaymentReceipt con el resultado de la transacción
         """
-        card_number = payment_info.get("card_number", "")
+        # Se lee del diccionario una sola vez; None cuenta como ausente
+        card_number = payment_info.get("card_number") or ""
 
         # Validaciones básicas
         if not card_number:
@@ -60,28 +109,27 @@ class PaymentGateway:
         if len(card_number) < 15:
             return PaymentReceipt(success=False, message="Número de tarjeta inválido")
 
-        # Simulación de validación y riesgo
-        first_digit = card_number[0]
-        behavior = self._card_behaviors.get(first_digit, "unknown")
-
-        if behavior in ["visa_success", "mastercard_success"]:
-            transaction_id = str(uuid.uuid4())
-            card_type = "Visa" if first_digit == "4" else "MasterCard"
-            print(
-                f"[Payment] Cargo exitoso: ${amount:.2f} en tarjeta {card_type} ****{card_number[-4:]}"
+        # Simulación de validación y riesgo (memoizada por BIN)
+        approved, card_type, message = _classify_bin(card_number[:6])
+        last_four = card_number[-4:]
+
+        if approved:
+            transaction_id = _TOKEN(16)
+            logger.info(
+                "[Payment] Cargo exitoso: $%.2f en tarjeta %s ****%s",
+                amount,
+                card_type,
+                last_four,
             )
             return PaymentReceipt(
                 success=True,
                 transaction_id=transaction_id,
                 amount=Decimal(str(amount)),
-                message=f"Pago procesado exitosamente con {card_type}",
+                message=message,
             )
         else:
-            print(f"[Payment] Pago rechazado para tarjeta ****{card_number[-4:]}")
-            return PaymentReceipt(
-                success=False,
-                message="Pago rechazado - Fondos insuficientes o tarjeta bloqueada",
-            )
+            logger.info("[Payment] Pago rechazado para tarjeta ****%s", last_four)
+            return PaymentReceipt(success=False, message=message)
 
     def refund(self, transaction_id: str, amount: float) -> PaymentReceipt:
         """
@@ -99,9 +147,11 @@ class PaymentGateway:
                 success=False, message="ID de transacción requerido para reembolso"
             )
 
-        refund_id = str(uuid.uuid4())
-        print(
-            f"[Payment] Reembolso procesado: ${amount:.2f} (TX: {transaction_id[:8]}...)"
+        refund_id = _TOKEN(16)
+        logger.info(
+            "[Payment] Reembolso procesado: $%.2f (TX: %s...)",
+            amount,
+            transaction_id[:8],
         )
         return PaymentReceipt(
             success=True,
@@ -120,14 +170,22 @@ class PaymentGateway:
         Returns:
             True si la tarjeta es válida, False en caso contrario
         """
-        card_number = payment_info.get("card_number", "")
-        cvv = payment_info.get("cvv", "")
-        expiry = payment_info.get("expiry", "")
+        card_number = (payment_info.get("card_number") or "").translate(
+            _CARD_SEPARATORS
+        )
+        cvv = payment_info.get("cvv") or ""
+        expiry = payment_info.get("expiry") or ""
 
         # Validaciones básicas
         if len(card_number) < 15 or len(card_number) > 19:
             return False
 
+        if not (card_number.isascii() and card_number.isdigit()):
+            return False
+
+        if not _luhn(card_number):
+            return False
+
         if len(cvv) < 3 or len(cvv) > 4:
             return False
 
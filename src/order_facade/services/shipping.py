@@ -5,13 +5,34 @@ Este módulo maneja la creación de envíos y cálculo de tiempos de entrega
 para el sistema de logística.
 """
 
-import uuid
+import logging
+import random
+import sys
+import time
 from dataclasses import dataclass
-from typing import List, Dict, Optional, Union
-from datetime import datetime, timedelta
+from types import MappingProxyType
+from typing import Any, ClassVar, List, Dict, Mapping, Optional, Tuple, Union
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+# __slots__ en dataclasses solo está disponible a partir de Python 3.10
+_DATACLASS_SLOTS: Dict[str, Any] = (
+    {"slots": True} if sys.version_info >= (3, 10) else {}
+)
+
+# Marca la ausencia de la clave "city" en una dirección
+_NO_CITY = object()
+
+# Estados simulados de un envío en tránsito
+_TRACKING_STATUSES = (
+    "Paquete recibido en centro de distribución",
+    "En tránsito",
+    "En reparto",
+    "Entregado",
+)
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class ShipmentInfo:
     """Información de envío con detalles logísticos."""
 
@@ -27,20 +48,61 @@ class ShipmentInfo:
 class ShippingService:
     """Servicio de envíos para gestionar la logística de productos."""
 
-    def __init__(self) -> None:
-        """Inicializa el servicio con configuración de carriers."""
-        self._carriers: Dict[str, Dict[str, Union[str, int, float]]] = {
-            "standard": {"name": "Correos Nacionales", "days": 5, "cost": 10.0},
-            "express": {"name": "Express Delivery", "days": 3, "cost": 25.0},
-            "premium": {"name": "Premium Logistics", "days": 1, "cost": 50.0},
+    # Configuración de carriers compartida por todas las instancias (solo lectura)
+    _CARRIERS: ClassVar[Mapping[str, Mapping[str, Union[str, int, float]]]] = (
+        MappingProxyType(
+            {
+                "standard": MappingProxyType(
+                    {"name": "Correos Nacionales", "days": 5, "cost": 10.0}
+                ),
+                "express": MappingProxyType(
+                    {"name": "Express Delivery", "days": 3, "cost": 25.0}
+                ),
+                "premium": MappingProxyType(
+                    {"name": "Premium Logistics", "days": 1, "cost": 50.0}
+                ),
+            }
+        )
+    )
+    # Versión normalizada (nombre, días, costo) para la ruta crítica
+    _CARRIER_FAST: ClassVar[Dict[str, Tuple[str, int, float]]] = {
+        key: (str(info["name"]), int(info["days"]), float(info["cost"]))
+        for key, info in _CARRIERS.items()
+    }
+
+    # Zonas de cobertura simuladas
+    _COVERAGE_ZONES: ClassVar[Mapping[str, Tuple[str, ...]]] = MappingProxyType(
+        {
+            "zone_1": ("Lima", "Callao", "Miraflores"),
+            "zone_2": ("Arequipa", "Trujillo", "Chiclayo"),
+            "zone_3": ("Cusco", "Huancayo", "Piura"),
         }
+    )
+    # Ciudades asignadas a clientes sin dirección (simulado)
+    _CITIES: ClassVar[Tuple[str, ...]] = (
+        "Lima",
+        "Arequipa",
+        "Trujillo",
+        "Cusco",
+        "Chiclayo",
+    )
+    # Índice invertido ciudad -> zona para búsquedas O(1)
+    _CITY_TO_ZONE: ClassVar[Dict[str, str]] = {
+        city: zone for zone, cities in _COVERAGE_ZONES.items() for city in cities
+    }
+
+    # (segundo epoch, texto formateado) de la última marca de rastreo generada
+    _last_update_cache: Tuple[int, str] = (-1, "")
+
+    def __init__(self, rng: Optional[random.Random] = None) -> None:
+        """
+        Inicializa el servicio.
 
-        # Zonas de cobertura simuladas
-        self._coverage_zones = {
-            "zone_1": ["Lima", "Callao", "Miraflores"],
-            "zone_2": ["Arequipa", "Trujillo", "Chiclayo"],
-            "zone_3": ["Cusco", "Huancayo", "Piura"],
-        }
+        Args:
+            rng: Generador para los estados simulados (por defecto uno propio;
+                 usar random.SystemRandom() si se requiere aleatoriedad del sistema)
+        """
+        self._rng = rng or random.Random()  # noqa: B311
 
     def create_shipment(
         self,
@@ -61,6 +123,10 @@ class ShippingService:
         Returns:
             ShipmentInfo con detalles del envío
         """
+        # Importaciones diferidas: solo la creación de envíos necesita uuid y fechas
+        import uuid
+        from datetime import date, timedelta
+
         # Validaciones básicas
         if not items:
             return ShipmentInfo(success=False, message="No hay productos para enviar")
@@ -68,41 +134,38 @@ class ShippingService:
         if not customer_id:
             return ShipmentInfo(success=False, message="ID de cliente requerido")
 
-        # Validar tipo de envío
-        if shipping_type not in self._carriers:
-            shipping_type = "standard"
+        # Validar tipo de envío (una sola búsqueda en el caso común)
+        carrier = self._CARRIER_FAST.get(shipping_type)
+        if carrier is None:
+            carrier = self._CARRIER_FAST["standard"]
 
-        carrier_info = self._carriers[shipping_type]
+        carrier_name, days, _ = carrier
 
         # Generar IDs únicos
-        shipment_id = str(uuid.uuid4())
+        # .hex evita el formateo con guiones; el seguimiento usa sus 8 primeros
+        shipment_id = uuid.uuid4().hex
         tracking_number = f"TRK{shipment_id[:8].upper()}"
 
-        # Calcular fecha estimada de entrega
-        days_value = carrier_info["days"]
-        days = int(days_value) if isinstance(days_value, (int, float)) else 5
-        delivery_date = datetime.now() + timedelta(days=days)
-
         # Simular zona de cobertura
         city = self._get_customer_city(customer_id, shipping_address)
         zone = self._get_shipping_zone(city)
 
-        # Ajustar tiempo de entrega según la zona
-        if zone == "zone_3":
-            delivery_date += timedelta(days=1)  # Zona remota
+        # Calcular fecha estimada de entrega (+1 día en zona remota)
+        total_days = days + (1 if zone == "zone_3" else 0)
+        delivery_str = (date.today() + timedelta(days=total_days)).isoformat()
 
-        print(f"[Shipping] Envío creado: {tracking_number} via {carrier_info['name']}")
-        print(f"[Shipping] Destino: {city} (Zona {zone[-1]})")
-        print(f"[Shipping] Entrega estimada: {delivery_date.strftime('%Y-%m-%d')}")
+        logger.info("[Shipping] Envío creado: %s via %s", tracking_number, carrier_name)
+        logger.info("[Shipping] Destino: %s (Zona %s)", city, zone[-1])
+        logger.info("[Shipping] Entrega estimada: %s", delivery_str)
 
         return ShipmentInfo(
             success=True,
             shipment_id=shipment_id,
-            eta_days=days + (1 if zone == "zone_3" else 0),
+            eta_days=total_days,
             tracking_number=tracking_number,
-            carrier=str(carrier_info["name"]),
-            estimated_delivery=delivery_date.strftime("%Y-%m-%d"),
-            message=f"Envío programado via {carrier_info['name']}",
+            carrier=carrier_name,
+            estimated_delivery=delivery_str,
+            message=f"Envío programado via {carrier_name}",
         )
 
     def track_shipment(self, tracking_number: str) -> Dict:
@@ -116,24 +179,24 @@ class ShippingService:
             Diccionario con información de rastreo
         """
         # Simulación de estados de envío
-        statuses = [
-            "Paquete recibido en centro de distribución",
-            "En tránsito",
-            "En reparto",
-            "Entregado",
-        ]
-
-        import secrets
-
-        current_status = secrets.choice(statuses)  # noqa: B311
+        current_status = self._rng.choice(_TRACKING_STATUSES)
 
         return {
             "tracking_number": tracking_number,
             "status": current_status,
-            "last_update": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "last_update": self._get_last_update(),
             "location": "Centro de Distribución Lima",
         }
 
+    def _get_last_update(self) -> str:
+        """Obtiene la marca de rastreo actual (reutilizada dentro del mismo segundo)."""
+        now_sec = int(time.time())
+        cached_sec, cached_value = ShippingService._last_update_cache
+        if now_sec != cached_sec:
+            cached_value = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now_sec))
+            ShippingService._last_update_cache = (now_sec, cached_value)
+        return cached_value
+
     def cancel_shipment(self, shipment_id: str) -> bool:
         """
         Cancela un envío.
@@ -144,7 +207,7 @@ class ShippingService:
         Returns:
             True si la cancelación fue exitosa
         """
-        print(f"[Shipping] Envío {shipment_id[:8]}... cancelado")
+        logger.info("[Shipping] Envío %s... cancelado", shipment_id[:8])
         return True
 
     def calculate_shipping_cost(
@@ -160,46 +223,45 @@ class ShippingService:
         Returns:
             Costo total de envío
         """
-        carrier_data = self._carriers.get(shipping_type, self._carriers["standard"])
-        cost_value = carrier_data["cost"]
-        base_cost = float(cost_value) if isinstance(cost_value, (int, float)) else 10.0
+        carrier = self._CARRIER_FAST.get(shipping_type)
+        if carrier is None:
+            carrier = self._CARRIER_FAST["standard"]
+        _, _, base_cost = carrier
 
         # Costo adicional por peso (simulado)
-        weights = []
-        for item in items:
-            weight = item.get("weight", 1)
-            weights.append(float(weight) if isinstance(weight, (int, float)) else 1.0)
-
-        total_weight = sum(weights)
-        weight_cost = max(0, (total_weight - 2) * 5)  # Costo extra por kg adicional
+        # Una sola pasada sin lista intermedia; pesos no numéricos cuentan como 1 kg
+        total_weight = sum(
+            weight if isinstance(weight, (int, float)) else 1.0
+            for weight in (item.get("weight", 1) for item in items)
+        )
+        weight_cost = max(0.0, (total_weight - 2) * 5)  # Costo extra por kg adicional
 
-        return float(base_cost + weight_cost)
+        return base_cost + weight_cost
 
-    def get_available_carriers(self) -> Dict:
+    def get_available_carriers(
+        self,
+    ) -> Mapping[str, Mapping[str, Union[str, int, float]]]:
         """
         Obtiene la lista de carriers disponibles.
 
         Returns:
-            Diccionario con información de carriers
+            Vista de solo lectura con información de carriers
         """
-        carriers_copy: Dict[str, Dict[str, Union[str, int, float]]] = (
-            self._carriers.copy()
-        )
-        return carriers_copy
+        return self._CARRIERS
 
     def _get_customer_city(self, customer_id: str, address: Optional[Dict]) -> str:
         """Obtiene la ciudad del cliente (simulado)."""
-        if address and "city" in address:
-            city_value = address["city"]
-            return str(city_value) if city_value else "Lima"
+        if address:
+            # Una sola búsqueda; el centinela distingue "sin ciudad" de "ciudad vacía"
+            city_value = address.get("city", _NO_CITY)
+            if city_value is not _NO_CITY:
+                if not city_value:
+                    return "Lima"
+                return city_value if isinstance(city_value, str) else str(city_value)
 
         # Simulación basada en customer_id
-        cities = ["Lima", "Arequipa", "Trujillo", "Cusco", "Chiclayo"]
-        return cities[hash(customer_id) % len(cities)]
+        return self._CITIES[hash(customer_id) % len(self._CITIES)]
 
     def _get_shipping_zone(self, city: str) -> str:
         """Determina la zona de envío basada en la ciudad."""
-        for zone, cities in self._coverage_zones.items():
-            if city in cities:
-                return zone
-        return "zone_2"  # Zona por defecto
+        return self._CITY_TO_ZONE.get(city, "zone_2")  # Zona por defecto
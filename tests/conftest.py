@@ -1,7 +1,4 @@
-"""Archivo de configuración para pytest."""
+"""Archivo de configuración para pytest.
 
-import sys
-import os
-
-# Agregar el directorio src al Python path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
+El directorio src se agrega al path mediante ``pythonpath`` en pyproject.toml.
+"""
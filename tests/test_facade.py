@@ -5,19 +5,20 @@ Este módulo contiene tests completos para validar el funcionamiento
 del patrón Facade y todos sus subsistemas.
 """
 
+import asyncio
+import json
 import pytest
+import random
 import sys
-import os
-
-# Agregar el directorio src al path para importar los módulos
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
 from order_facade.facade import OrderFacade, OrderResult
 from order_facade.services.inventory import InventoryService
 from order_facade.services.payments import PaymentGateway, PaymentReceipt
 from order_facade.services.shipping import ShippingService, ShipmentInfo
 from order_facade.services.notifications import NotificationService, NotificationChannel
+from collections import deque
 from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor
 
 
 class MockPaymentGateway(PaymentGateway):
@@ -26,7 +27,7 @@ class MockPaymentGateway(PaymentGateway):
     def __init__(self, should_succeed=True):
         super().__init__()
         self.should_succeed = should_succeed
-        self.charged_amounts = []
+        self.charged_amounts = deque()
 
     def charge(self, payment_info, amount):
         self.charged_amounts.append(amount)
@@ -45,7 +46,7 @@ class MockShippingService(ShippingService):
     def __init__(self, should_succeed=True):
         super().__init__()
         self.should_succeed = should_succeed
-        self.created_shipments = []
+        self.created_shipments = deque()
 
     def create_shipment(
         self, customer_id, items, shipping_address=None, shipping_type="standard"
@@ -71,7 +72,7 @@ class MockNotificationService(NotificationService):
 
     def __init__(self):
         super().__init__()
-        self.sent_messages = []
+        self.sent_messages = deque()
 
     def notify(self, customer_id, message, channel=NotificationChannel.EMAIL):
         self.sent_messages.append(
@@ -93,6 +94,14 @@ class MockNotificationService(NotificationService):
         return {"email": "success"}
 
 
+@pytest.fixture
+def ready_inventory():
+    """Inventario con stock garantizado para el SKU de pruebas."""
+    inventory = InventoryService()
+    inventory.add_product("TEST-SKU", 10)
+    return inventory
+
+
 class TestInventoryService:
     """Tests para el servicio de inventario."""
 
@@ -118,6 +127,31 @@ class TestInventoryService:
         result = inventory.reserve("MONITOR-27", 20)  # Más del stock disponible
         assert result is False
 
+    def test_reserve_many_is_all_or_nothing(self):
+        """Test reserva de varias líneas: todas o ninguna."""
+        inventory = InventoryService()
+
+        assert inventory.reserve_many([("MONITOR-27", 2), ("LAPTOP-15", 1)]) is True
+        assert inventory.get_current_stock("MONITOR-27") == 8
+        assert inventory.get_current_stock("LAPTOP-15") == 4
+
+        assert inventory.reserve_many([("MONITOR-27", 1), ("TABLET-10", 5)]) is False
+        assert inventory.get_current_stock("MONITOR-27") == 8
+        assert inventory.get_current_stock("TABLET-10") == 3
+
+    def test_concurrent_reserve_never_oversells(self):
+        """Test que reservas concurrentes no venden más del stock disponible."""
+        inventory = InventoryService()
+        inventory.add_product("TEST-SKU", 50)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(
+                pool.map(lambda _: inventory.reserve("TEST-SKU", 1), range(80))
+            )
+
+        assert sum(results) == 50
+        assert inventory.get_current_stock("TEST-SKU") == 0
+
     def test_release_stock(self):
         """Test liberación de stock."""
         inventory = InventoryService()
@@ -173,6 +207,16 @@ class TestPaymentGateway:
         assert receipt.success is False
         assert "inválido" in receipt.message
 
+    def test_validate_card_luhn(self):
+        """Test validación Luhn del número de tarjeta."""
+        gateway = PaymentGateway()
+        base = {"cvv": "123", "expiry": "12/30"}
+
+        assert gateway.validate_card({**base, "card_number": "4111111111111111"})
+        assert gateway.validate_card({**base, "card_number": "4111 1111 1111 1111"})
+        assert not gateway.validate_card({**base, "card_number": "4111111111111112"})
+        assert not gateway.validate_card({**base, "card_number": "4111-1111-1111-111x"})
+
 
 class TestShippingService:
     """Tests para el servicio de envíos."""
@@ -207,6 +251,24 @@ class TestShippingService:
         assert cost_express > cost_standard
         assert cost_standard >= 10.0  # Costo mínimo
 
+    def test_track_shipment_uses_injected_rng(self):
+        """Test que el rastreo usa el generador propio del servicio."""
+        first = ShippingService(rng=random.Random(42)).track_shipment("TRK1")
+        second = ShippingService(rng=random.Random(42)).track_shipment("TRK1")
+
+        assert first["status"] == second["status"]
+        assert first["tracking_number"] == "TRK1"
+
+    def test_available_carriers_is_read_only(self):
+        """Test que los carriers se exponen como vista de solo lectura."""
+        shipping = ShippingService()
+        carriers = shipping.get_available_carriers()
+
+        assert carriers["express"]["name"] == "Express Delivery"
+        assert shipping.get_available_carriers() is carriers
+        with pytest.raises(TypeError):
+            carriers["express"]["cost"] = 0.0
+
 
 class TestNotificationService:
     """Tests para el servicio de notificaciones."""
@@ -243,23 +305,122 @@ class TestNotificationService:
         history = notifications.get_notification_history("customer-123")
         assert len(history) == 2
 
+    def test_notification_stats(self):
+        """Test estadísticas por canal y por cliente."""
+        notifications = NotificationService()
+
+        notifications.notify("customer-123", "Message 1")
+        notifications.notify("customer-123", "Message 2", NotificationChannel.SMS)
+        notifications.notify("customer-456", "Message 3")
+
+        stats = notifications.get_notification_stats()
+        assert stats["total"] == 3
+        assert stats["by_channel"] == {"email": 2, "sms": 1}
+        assert stats["by_customer"] == {"customer-123": 2, "customer-456": 1}
+
+    def test_notification_history_is_bounded(self, monkeypatch):
+        """Test historial acotado: descarta lo antiguo y conserva las estadísticas."""
+        monkeypatch.setattr(NotificationService, "MAX_HISTORY", 3)
+        notifications = NotificationService()
+
+        # Suficientes envíos para descartar y compactar varias veces
+        for i in range(10):
+            customer_id = "customer-even" if i % 2 == 0 else "customer-odd"
+            notifications.notify(customer_id, f"Message {i}")
+
+        even = notifications.get_notification_history("customer-even")
+        odd = notifications.get_notification_history("customer-odd")
+        assert [entry["message"] for entry in even] == ["Message 8"]
+        assert [entry["message"] for entry in odd] == ["Message 7", "Message 9"]
+
+        stats = notifications.get_notification_stats()
+        assert stats["total"] == 10
+        assert stats["by_customer"] == {"customer-even": 5, "customer-odd": 5}
+
+    def test_customer_preferences(self):
+        """Test preferencias de canal por cliente."""
+        notifications = NotificationService()
+        notifications.set_customer_preferences(
+            "customer-123", [NotificationChannel.SMS, NotificationChannel.PUSH]
+        )
+
+        result = notifications.send_order_notification(
+            "customer-123", "order_delivered", {"order_id": "order-1"}
+        )
+        assert result == {"sms": "success", "push": "success"}
+
+        with pytest.raises(ValueError):
+            notifications.set_customer_preferences("customer-123", ["fax"])
+
+    def test_invalid_channel_keeps_history_consistent(self):
+        """Test que un canal inválido no desalinea el historial."""
+        notifications = NotificationService()
+
+        assert notifications.notify("customer-1", "hello", "email") is False
+        assert notifications.get_notification_history("customer-1") == []
+
+        assert notifications.notify("customer-1", "Message 1") is True
+        history = notifications.get_notification_history("customer-1")
+        assert [(h["message"], h["channel"]) for h in history] == [
+            ("Message 1", "email")
+        ]
+        assert notifications.get_notification_stats()["total"] == 1
+
+    def test_bulk_notification_records_each_recipient(self):
+        """Test envío masivo: historial y resultado por destinatario."""
+        notifications = NotificationService()
+        customers = ["customer-1", "customer-2"]
+
+        result = notifications.send_bulk_notification(
+            customers, "Oferta", NotificationChannel.SMS
+        )
+
+        assert result["sent"] == 2
+        assert notifications.get_notification_stats()["by_channel"] == {"sms": 2}
+        assert len(notifications.get_notification_history("customer-2")) == 1
+
+    def test_bulk_notification_invalid_channel_fails_each_entry(self):
+        """Test envío masivo con canal inválido: falla sin registrar nada."""
+        notifications = NotificationService()
+
+        result = notifications.send_bulk_notification(
+            ["customer-1", "customer-2"], "Oferta", "fax"
+        )
+
+        assert result["sent"] == 0
+        assert result["failed"] == 2
+        assert notifications.get_notification_stats()["total"] == 0
+        assert notifications.get_notification_history("customer-1") == []
+
+    def test_bulk_notification_async(self):
+        """Test envío masivo concurrente."""
+        notifications = NotificationService()
+        customers = ["customer-1", "customer-2", "customer-3"]
+
+        result = asyncio.run(
+            notifications.send_bulk_notification_async(
+                customers, "Oferta", max_concurrency=2
+            )
+        )
+
+        assert result["sent"] == 3
+        assert result["failed"] == 0
+        assert [d["customer_id"] for d in result["details"]] == customers
+
 
 class TestOrderFacade:
     """Tests para el Facade principal."""
 
-    def test_place_order_success(self):
+    def test_place_order_success(self, ready_inventory):
         """Test pedido exitoso completo."""
         # Configurar mocks
-        inventory = InventoryService()
+        inventory = ready_inventory
         payments = MockPaymentGateway(should_succeed=True)
         shipping = MockShippingService(should_succeed=True)
         notifications = MockNotificationService()
 
         facade = OrderFacade(inventory, payments, shipping, notifications)
 
-        # Asegurar que hay stock
-        inventory._stock["TEST-SKU"] = 10
-
         payment_info = {"card_number": "4111111111111111", "cvv": "123"}
 
         result = facade.place_order("customer-123", "TEST-SKU", 2, payment_info, 50.0)
@@ -278,10 +439,82 @@ class TestOrderFacade:
         # Verificar que se redujo el stock
         assert inventory.get_current_stock("TEST-SKU") == 8
 
+    @pytest.mark.parametrize(
+        "qty, unit_price, expected",
+        [(100, 0.005, Decimal("10.50")), (8, 0.125, Decimal("11.00"))],
+    )
+    def test_place_order_rounds_total_half_up(self, qty, unit_price, expected):
+        """Test el subtotal se redondea a centavos una vez, tras multiplicar."""
+        inventory = InventoryService()
+        inventory.add_product("TEST-SKU", 1000)
+        facade = OrderFacade(
+            inventory,
+            MockPaymentGateway(should_succeed=True),
+            ShippingService(),
+            MockNotificationService(),
+        )
+        payment_info = {"card_number": "4111111111111111", "cvv": "123"}
+
+        result = facade.place_order(
+            "customer-123", "TEST-SKU", qty, payment_info, unit_price
+        )
+
+        assert result.success is True
+        assert result.total_amount == expected
+
+    def test_place_order_async_success(self, ready_inventory):
+        """Test pedido exitoso usando la versión asíncrona del facade."""
+        inventory = ready_inventory
+        payments = MockPaymentGateway(should_succeed=True)
+        shipping = MockShippingService(should_succeed=True)
+        notifications = MockNotificationService()
+
+        facade = OrderFacade(inventory, payments, shipping, notifications)
+        payment_info = {"card_number": "4111111111111111", "cvv": "123"}
+
+        result = asyncio.run(
+            facade.place_order_async("customer-123", "TEST-SKU", 2, payment_info, 50.0)
+        )
+
+        assert result.success is True
+        assert result.tracking_number == "TRK12345678"
+        assert inventory.get_current_stock("TEST-SKU") == 8
+
+        # Confirmación y envío se envían ambas, en cualquier orden
+        sent_types = {msg["type"] for msg in notifications.sent_messages}
+        assert sent_types == {"order_confirmed", "order_shipped"}
+        assert facade.get_order_status(result.order_id) is not None
+
+    def test_shipping_cost_is_memoized(self):
+        """Test que el costo de envío se calcula una vez por (sku, qty, tipo)."""
+        shipping = MockShippingService(should_succeed=True)
+        calls = []
+        original = shipping.calculate_shipping_cost
+
+        def counting_cost(items, shipping_type="standard"):
+            calls.append(shipping_type)
+            return original(items, shipping_type)
+
+        shipping.calculate_shipping_cost = counting_cost
+        facade = OrderFacade(
+            payments=MockPaymentGateway(should_succeed=True),
+            shipping=shipping,
+            notifications=MockNotificationService(),
+        )
+        payment_info = {"card_number": "4111111111111111", "cvv": "123"}
+
+        for _ in range(3):
+            result = facade.place_order(
+                "customer-123", "MONITOR-27", 1, payment_info, 10.0
+            )
+            assert result.success is True
+
+        assert calls == ["standard"]
+
     def test_place_order_insufficient_stock(self):
         """Test pedido con stock insuficiente."""
         inventory = InventoryService()
-        inventory._stock["LOW-STOCK"] = 1
+        inventory.add_product("LOW-STOCK", 1)
 
         facade = OrderFacade(inventory=inventory)
         payment_info = {"card_number": "4111111111111111", "cvv": "123"}
@@ -292,10 +525,9 @@ class TestOrderFacade:
         assert "insuficiente" in result.reason.lower()
         assert inventory.get_current_stock("LOW-STOCK") == 1  # Stock no cambió
 
-    def test_place_order_payment_declined(self):
+    def test_place_order_payment_declined(self, ready_inventory):
         """Test pedido con pago rechazado."""
-        inventory = InventoryService()
-        inventory._stock["TEST-SKU"] = 10
+        inventory = ready_inventory
 
         payments = MockPaymentGateway(should_succeed=False)
         notifications = MockNotificationService()
@@ -323,10 +555,9 @@ class TestOrderFacade:
         ]
         assert len(payment_fail_notifications) >= 1
 
-    def test_place_order_shipping_failed(self):
+    def test_place_order_shipping_failed(self, ready_inventory):
         """Test pedido con falla en el envío."""
-        inventory = InventoryService()
-        inventory._stock["TEST-SKU"] = 10
+        inventory = ready_inventory
 
         payments = MockPaymentGateway(should_succeed=True)
         shipping = MockShippingService(should_succeed=False)
@@ -342,11 +573,10 @@ class TestOrderFacade:
         assert result.transaction_id == "tx-test-123"  # Pago se procesó
         assert inventory.get_current_stock("TEST-SKU") == 10  # Stock liberado por falla
 
-    def test_cancel_order(self):
+    def test_cancel_order(self, ready_inventory):
         """Test cancelación de pedido."""
         # Crear un pedido exitoso primero
-        inventory = InventoryService()
-        inventory._stock["TEST-SKU"] = 10
+        inventory = ready_inventory
 
         payments = MockPaymentGateway(should_succeed=True)
         shipping = MockShippingService(should_succeed=True)
@@ -369,10 +599,9 @@ class TestOrderFacade:
         # Verificar que el stock se restauró
         assert inventory.get_current_stock("TEST-SKU") > stock_after_order
 
-    def test_get_order_status(self):
+    def test_get_order_status(self, ready_inventory):
         """Test consulta de estado de pedido."""
-        inventory = InventoryService()
-        inventory._stock["TEST-SKU"] = 10
+        inventory = ready_inventory
 
         facade = OrderFacade(inventory=inventory)
         payment_info = {"card_number": "4111111111111111", "cvv": "123"}
@@ -387,10 +616,9 @@ class TestOrderFacade:
         assert status["order_id"] == result.order_id
         assert status["customer_id"] == "customer-123"
 
-    def test_get_order_history(self):
+    def test_get_order_history(self, ready_inventory):
         """Test historial de pedidos del cliente."""
-        inventory = InventoryService()
-        inventory._stock["TEST-SKU"] = 10
+        inventory = ready_inventory
 
         facade = OrderFacade(inventory=inventory)
         payment_info = {"card_number": "4111111111111111", "cvv": "123"}
@@ -407,6 +635,44 @@ class TestOrderFacade:
         assert result1.order_id in order_ids
         assert result2.order_id in order_ids
 
+    def test_order_history_is_bounded(self, ready_inventory, monkeypatch):
+        """Test que el historial descarta los pedidos más antiguos."""
+        monkeypatch.setattr(OrderFacade, "MAX_HISTORY", 2)
+        inventory = ready_inventory
+
+        facade = OrderFacade(inventory=inventory)
+        payment_info = {"card_number": "4111111111111111", "cvv": "123"}
+
+        results = [
+            facade.place_order("customer-123", "TEST-SKU", 1, payment_info, 25.0)
+            for _ in range(3)
+        ]
+
+        history = facade.get_order_history("customer-123")
+        assert [order["order_id"] for order in history] == [
+            results[1].order_id,
+            results[2].order_id,
+        ]
+        assert facade.cancel_order(results[0].order_id, "customer-123") is False
+        assert facade.get_system_stats()["total_successful_orders"] == 3
+
+    @pytest.mark.skipif(
+        sys.version_info < (3, 10), reason="dataclass(slots=True) requiere 3.10+"
+    )
+    @pytest.mark.parametrize(
+        "result_cls, kwargs",
+        [
+            (OrderResult, {"order_id": "order-123"}),
+            (ShipmentInfo, {"shipment_id": "shipment-123"}),
+        ],
+    )
+    def test_result_dataclasses_use_slots(self, result_cls, kwargs):
+        """Test que los resultados no reservan un __dict__ por instancia."""
+        result = result_cls(success=True, **kwargs)
+
+        assert hasattr(result_cls, "__slots__")
+        assert not hasattr(result, "__dict__")
+
     def test_get_system_stats(self):
         """Test estadísticas del sistema."""
         facade = OrderFacade()
@@ -420,6 +686,14 @@ class TestOrderFacade:
         assert "notification_stats" in stats
         assert "available_carriers" in stats
 
+    def test_get_system_stats_is_json_serializable(self):
+        """Test las estadísticas se pueden serializar a JSON."""
+        facade = OrderFacade()
+
+        payload = json.loads(json.dumps(facade.get_system_stats()))
+
+        assert payload["available_carriers"]["standard"]["cost"] == 10.0
+
 
 class TestIntegration:
     """Tests de integración completos."""
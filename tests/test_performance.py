@@ -7,6 +7,7 @@ la eficiencia del patrón Facade en diferentes escenarios.
 
 import pytest
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 from order_facade import OrderFacade
 
@@ -14,14 +15,14 @@ from order_facade import OrderFacade
 class TestPerformance:
     """Tests de rendimiento para OrderFacade."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def facade(self):
-        """Fixture para crear una instancia de OrderFacade."""
+        """Fixture para crear una instancia de OrderFacade compartida por el módulo."""
         return OrderFacade()
 
     def test_basic_order_performance(self, facade):
         """Test básico de rendimiento para crear un pedido."""
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         result = facade.place_order(
             customer_id="perf_test_001",
@@ -37,7 +38,7 @@ class TestPerformance:
             unit_price=999.99,
         )
 
-        end_time = time.time()
+        end_time = time.perf_counter()
         execution_time = end_time - start_time
 
         assert result.success
@@ -45,7 +46,7 @@ class TestPerformance:
 
     def test_multiple_orders_performance(self, facade):
         """Test de rendimiento para múltiples pedidos."""
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         results = []
         for i in range(5):
@@ -64,7 +65,7 @@ class TestPerformance:
             )
             results.append(result)
 
-        end_time = time.time()
+        end_time = time.perf_counter()
         execution_time = end_time - start_time
 
         # Verificar que todos fueron exitosos
@@ -92,9 +93,9 @@ class TestPerformance:
                 unit_price=649.99,
             )
 
-        start_time = time.time()
+        start_time = time.perf_counter()
         stats = facade.get_system_statistics()
-        end_time = time.time()
+        end_time = time.perf_counter()
         execution_time = end_time - start_time
 
         assert isinstance(stats, dict)
@@ -136,29 +137,33 @@ class TestScalability:
 
     def test_concurrent_orders_simulation(self):
         """Simula pedidos concurrentes."""
-        start_time = time.time()
-
-        # Simular procesamiento concurrente con múltiples facades
+        # Simular procesamiento concurrente con múltiples facades (creadas fuera
+        # de la región medida)
         facades = [OrderFacade() for _ in range(3)]
-        results = []
-
-        for i, f in enumerate(facades):
-            result = f.place_order(
-                customer_id=f"concurrent_{i:03d}",
-                sku="LAPTOP-15",
-                qty=1,
-                payment_info={
-                    "card_number": "4111111111111111",
-                    "card_holder": f"Concurrent User {i}",
-                    "expiry_month": "12",
-                    "expiry_year": "2025",
-                    "cvv": "123",
-                },
-                unit_price=999.99,
-            )
-            results.append(result)
 
-        end_time = time.time()
+        start_time = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=len(facades)) as executor:
+            futures = [
+                executor.submit(
+                    f.place_order,
+                    customer_id=f"concurrent_{i:03d}",
+                    sku="LAPTOP-15",
+                    qty=1,
+                    payment_info={
+                        "card_number": "4111111111111111",
+                        "card_holder": f"Concurrent User {i}",
+                        "expiry_month": "12",
+                        "expiry_year": "2025",
+                        "cvv": "123",
+                    },
+                    unit_price=999.99,
+                )
+                for i, f in enumerate(facades)
+            ]
+            results = [future.result() for future in futures]
+
+        end_time = time.perf_counter()
         execution_time = end_time - start_time
 
         # Verificar que se ejecutó en tiempo razonable
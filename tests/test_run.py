@@ -0,0 +1,28 @@
+"""
+Tests del script de inicio rápido run.py.
+"""
+
+import pytest
+
+from run import count_lines
+
+
+class TestCountLines:
+    """Tests para el conteo de líneas de la opción 6."""
+
+    @pytest.mark.parametrize("lines", [3, 1000])  # Menor y mayor que 4 KiB
+    @pytest.mark.parametrize("trailing_newline", [True, False])
+    def test_count_lines(self, tmp_path, lines, trailing_newline):
+        """Test cuenta saltos de línea con y sin salto final."""
+        content = "\n".join(f"linea {i:04d}" for i in range(lines))
+        if trailing_newline:
+            content += "\n"
+        path = tmp_path / "sample.py"
+        path.write_text(content)
+
+        expected = lines if trailing_newline else lines - 1
+        assert count_lines(path) == expected
+
+    def test_count_lines_missing_file(self, tmp_path):
+        """Test un archivo inexistente cuenta como cero líneas."""
+        assert count_lines(tmp_path / "missing.py") == 0